@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..model import AuditEvent
+from ..security import get_current_user
+
+router = APIRouter()
+
+@router.get("/audit")
+def get_audit_events(
+    actor_id: Optional[int] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Only admins can view the audit log.")
+
+    # Filters line up with the (actor_id, created_at) and (action, created_at) indexes
+    query = db.query(AuditEvent)
+    if actor_id is not None:
+        query = query.filter(AuditEvent.actor_id == actor_id)
+    if action:
+        query = query.filter(AuditEvent.action == action)
+    if since:
+        query = query.filter(AuditEvent.created_at >= since)
+    if until:
+        query = query.filter(AuditEvent.created_at < until)
+
+    return query.order_by(AuditEvent.created_at.desc(), AuditEvent.audit_id.desc()).offset(offset).limit(limit).all()
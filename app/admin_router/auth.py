@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 import os
 from ..database import get_db
 from ..model import User, Role
 from ..schemas import UserCreate, Login
-from ..security import hash_password, verify_password, create_access_token
+from ..security import hash_password, authenticate_user, issue_tokens
 from ..logger import logger
 
 router = APIRouter()
@@ -50,27 +50,16 @@ def register_admin(user: UserCreate, secret_key: str, db: Session = Depends(get_
     }
 
 
-@router.post("/login-admin")
+# Deprecated: use POST /login
+@router.post("/login-admin", deprecated=True)
 
 def login_admin(
     login_data:Login,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).join(Role).filter(User.email == login_data.email, Role.role_name == "Admin").first()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="Admin not found")
-
-
-    if not verify_password(login_data.password, user.password_hash):
-        raise HTTPException(status_code=401, detail="Invalid password")
-
-    access_token = create_access_token(
-        data={"user_id": user.user_id, "role": "Admin"}
-    )
+    user = authenticate_user(request, db, login_data.email, login_data.password, role="Admin")
+    tokens = issue_tokens(db, user.user_id, "Admin")
 
     logger.info(f"Admin login successful: {user.email}")
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
\ No newline at end of file
+    return tokens
\ No newline at end of file
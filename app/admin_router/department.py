@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException,status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..model import User, Department,Role,Course
+from ..model import User, Department,Role,Course,student_courses
+from ..change_tracking import record_enrollment_tombstones
 from ..schemas import DepartmentCreate, DepartmentUpdate
 from ..security import get_current_user
+from ..events import change_feed
+from ..audit import audit_log
 from ..logger import logger
 import os
 
@@ -41,6 +45,8 @@ def create_department(
     db.commit()
     db.refresh(new_department)
 
+    audit_log.record(current_user["user_id"], "department.create", "department", new_department.department_id,
+                     new_department.department_name)
     logger.info(f"Department created: {new_department.department_name}")
     return {"message": "Department created successfully", "department_id": new_department.department_id}
 
@@ -91,6 +97,8 @@ def update_department(
 
     db.commit()
     db.refresh(department)
+    audit_log.record(current_user["user_id"], "department.update", "department", department.department_id,
+                     department.department_name)
     logger.info(f"Department updated: {department.department_name}")
     return {"message": "Department updated successfully"}
 
@@ -108,9 +116,25 @@ def delete_department(
     if not department:
         raise HTTPException(status_code=404, detail="Department not found.")
 
-    db.delete(department)
+    # The row is deleted with a bulk DELETE, so read what we log before the instance goes stale
+    department_name = department.department_name
+
+    # Courses and their enrollments are removed by ON DELETE CASCADE in the database
+    courses = db.query(Course.course_id, Course.instructor_id, Course.course_code).filter(
+        Course.department_id == department_id
+    ).all()
+    record_enrollment_tombstones(db, student_courses.c.course_id.in_(
+        select(Course.course_id).where(Course.department_id == department_id)
+    ))
+    db.query(Department).filter(Department.department_id == department_id).delete(synchronize_session=False)
     db.commit()
-    logger.info(f"Department deleted: {department.department_name}")
+
+    for course in courses:
+        change_feed.publish("course_deleted", course.course_id, instructor_id=course.instructor_id,
+                            course_code=course.course_code)
+    audit_log.record(current_user["user_id"], "department.delete", "department", department_id,
+                     department_name)
+    logger.info(f"Department deleted: {department_name}")
     return {"message": "Department deleted successfully"}
 
 @router.put("/assign-department-head/{department_id}")
@@ -133,6 +157,8 @@ def assign_department_head(
 
     department.head_user_id = new_head_id
     db.commit()
+    audit_log.record(current_user["user_id"], "department.assign_head", "department", department_id,
+                     f"head_user_id={new_head_id}")
     logger.info(
         f"Admin {current_user['user_id']} assigned Teacher {new_head.user_id} as head of Department {department_id}")
 
@@ -158,6 +184,11 @@ def assign_course_instructor(
 
     course.instructor_id = new_instructor_id
     db.commit()
+
+    change_feed.publish("course_updated", course.course_id, instructor_id=new_instructor_id,
+                        course_code=course.course_code)
+    audit_log.record(current_user["user_id"], "course.assign_instructor", "course", course_id,
+                     f"instructor_id={new_instructor_id}")
     logger.info(
         f"Admin {current_user['user_id']} assigned Teacher {new_instructor.user_id} as instructor for Course {course_id}")
 
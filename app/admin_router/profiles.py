@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from ..security import get_current_user
+from ..profiling import profile_store
+
+router = APIRouter()
+
+
+def _require_admin(current_user: dict):
+    if current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Only admins can view profiles.")
+
+
+def _load_profile(profile_id: str):
+    try:
+        profile = profile_store.load(profile_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid profile id.")
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return profile
+
+
+@router.get("/profiles")
+def list_profiles(current_user: dict = Depends(get_current_user)):
+    _require_admin(current_user)
+
+    summaries = []
+    for profile_id in profile_store.ids():
+        profile = profile_store.load(profile_id)
+        if profile is None:
+            continue
+        summaries.append({key: profile[key] for key in (
+            "id", "method", "path", "status", "reason", "duration_ms", "sql_count", "sql_ms"
+        )})
+    return summaries
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str, current_user: dict = Depends(get_current_user)):
+    _require_admin(current_user)
+    _load_profile(profile_id)
+
+    return FileResponse(
+        profile_store.path(profile_id),
+        media_type="application/json",
+        filename=f"profile_{profile_id}.json"
+    )
+
+
+@router.get("/profiles/{profile_id}/folded", response_class=PlainTextResponse)
+def download_folded_stacks(profile_id: str, current_user: dict = Depends(get_current_user)):
+    _require_admin(current_user)
+    return _load_profile(profile_id)["folded_stacks"]
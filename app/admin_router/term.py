@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..model import Term
+from ..schemas import TermCreate
+from ..security import get_current_user
+from ..archive import archive_term
+from ..logger import logger
+
+router = APIRouter()
+
+@router.post("/terms", status_code=201)
+def create_term(
+    term_data: TermCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Only admins can create terms.")
+
+    if term_data.end_date <= term_data.start_date:
+        raise HTTPException(status_code=400, detail="Term must end after it starts.")
+
+    existing_term = db.query(Term).filter_by(term_name=term_data.term_name).first()
+    if existing_term:
+        raise HTTPException(status_code=400, detail="Term already exists.")
+
+    new_term = Term(
+        term_name=term_data.term_name,
+        start_date=term_data.start_date,
+        end_date=term_data.end_date
+    )
+    db.add(new_term)
+    db.commit()
+    db.refresh(new_term)
+
+    logger.info(f"Term created: {new_term.term_name}")
+    return {"message": "Term created successfully", "term_id": new_term.term_id}
+
+
+@router.get("/terms")
+def get_terms(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] not in ["Admin", "Teacher"]:
+        raise HTTPException(status_code=403, detail="Only admins and teachers can view terms.")
+
+    return db.query(Term).order_by(Term.start_date.desc()).all()
+
+
+@router.put("/terms/{term_id}/close")
+def close_term(
+    term_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Only admins can close terms.")
+
+    term = db.query(Term).filter_by(term_id=term_id).first()
+    if not term:
+        raise HTTPException(status_code=404, detail="Term not found.")
+
+    term.is_closed = True
+    db.commit()
+
+    logger.info(f"Term closed by admin {current_user['user_id']}: {term.term_name}")
+    return {"message": "Term closed successfully"}
+
+
+@router.post("/terms/{term_id}/archive")
+def archive_term_endpoint(
+    term_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Only admins can archive terms.")
+
+    term = db.query(Term).filter_by(term_id=term_id).first()
+    if not term:
+        raise HTTPException(status_code=404, detail="Term not found.")
+    if not term.is_closed:
+        raise HTTPException(status_code=400, detail="Only closed terms can be archived.")
+    if term.archived_at is not None:
+        raise HTTPException(status_code=400, detail="Term is already archived.")
+
+    moved = archive_term(db, term)
+    return {"message": "Term archived successfully", **moved}
@@ -0,0 +1,80 @@
+"""Move closed academic terms out of the hot courses/student_courses tables.
+
+Run from cron with ``python -m app.archive`` to archive every closed term, or
+through POST /admin/terms/{term_id}/archive for a single term.
+"""
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from .change_tracking import record_enrollment_tombstones
+from .database import SessionLocal
+from .events import change_feed
+from .model import Course, CourseArchive, Term, student_courses, student_courses_archive
+from .logger import logger
+
+
+def archive_term(db: Session, term: Term):
+    """Copy the term's enrollments and courses into the archive tables and delete them.
+
+    Enrollments are selected by course, so every archived enrollment has its course in
+    courses_archive; an enrollment tagged with this term on a course of another term stays
+    live with its course. Set-based: five statements plus the term update, in one transaction.
+    """
+    term_courses = select(Course.course_id).where(Course.term_id == term.term_id)
+    term_enrollments = student_courses.c.course_id.in_(term_courses)
+    archived_courses = db.query(Course.course_id, Course.instructor_id, Course.course_code).filter(
+        Course.term_id == term.term_id
+    ).all()
+
+    db.execute(
+        insert(student_courses_archive).from_select(
+            ["student_id", "course_id", "term_id", "created_at"],
+            select(
+                student_courses.c.student_id,
+                student_courses.c.course_id,
+                func.coalesce(student_courses.c.term_id, term.term_id),
+                student_courses.c.created_at
+            ).where(term_enrollments)
+        )
+    )
+    # Delta export consumers see archived enrollments as deletions
+    record_enrollment_tombstones(db, term_enrollments)
+    enrollments = db.execute(delete(student_courses).where(term_enrollments)).rowcount
+
+    db.execute(
+        insert(CourseArchive).from_select(
+            ["course_id", "course_title", "course_code", "credits", "instructor_id",
+             "department_id", "term_id", "created_at"],
+            select(
+                Course.course_id, Course.course_title, Course.course_code, Course.credits, Course.instructor_id,
+                Course.department_id, Course.term_id, Course.created_at
+            ).where(Course.term_id == term.term_id)
+        )
+    )
+    courses = db.execute(delete(Course).where(Course.term_id == term.term_id)).rowcount
+
+    term.archived_at = datetime.utcnow()
+    db.commit()
+
+    # Archived courses leave the live tables; subscribers of this process see them as deleted
+    for course in archived_courses:
+        change_feed.publish("course_deleted", course.course_id, instructor_id=course.instructor_id,
+                            course_code=course.course_code, archived=True)
+
+    logger.info(f"Term {term.term_name} archived: {courses} course(s), {enrollments} enrollment(s)")
+    return {"courses": courses, "enrollments": enrollments}
+
+
+def archive_closed_terms():
+    db = SessionLocal()
+    try:
+        terms = db.query(Term).filter(Term.is_closed.is_(True), Term.archived_at.is_(None)).all()
+        for term in terms:
+            archive_term(db, term)
+        return len(terms)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print(f" {archive_closed_terms()} term(s) archived")
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..model import CourseArchive, Term, User, student_courses_archive
+from ..security import get_current_user
+
+router = APIRouter()
+
+# Read-only views over archived terms
+
+
+def _archived_term(db: Session, term_id: int):
+    term = db.query(Term).filter(Term.term_id == term_id).first()
+    if not term or term.archived_at is None:
+        raise HTTPException(status_code=404, detail="Archived term not found.")
+    return term
+
+
+@router.get("/terms/{term_id}/courses")
+def get_archived_courses(
+    term_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] not in ["Admin", "Teacher"]:
+        raise HTTPException(status_code=403, detail="Only admins and teachers can view archived courses.")
+
+    _archived_term(db, term_id)
+    query = db.query(CourseArchive).filter(CourseArchive.term_id == term_id)
+    if current_user["role"] == "Teacher":
+        query = query.filter(CourseArchive.instructor_id == current_user["user_id"])
+
+    return query.order_by(CourseArchive.course_id).offset(offset).limit(limit).all()
+
+
+@router.get("/terms/{term_id}/enrollments")
+def get_archived_enrollments(
+    term_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    _archived_term(db, term_id)
+    enrollments = student_courses_archive.c
+
+    query = db.query(
+        enrollments.student_id,
+        User.full_name.label("student_name"),
+        enrollments.course_id,
+        CourseArchive.course_code,
+        CourseArchive.course_title,
+        enrollments.created_at.label("enrolled_at")
+    ).join(
+        CourseArchive, CourseArchive.course_id == enrollments.course_id
+    ).outerjoin(
+        User, User.user_id == enrollments.student_id
+    ).filter(enrollments.term_id == term_id)
+
+    if current_user["role"] == "Teacher":
+        query = query.filter(CourseArchive.instructor_id == current_user["user_id"])
+    elif current_user["role"] == "Student":
+        query = query.filter(enrollments.student_id == current_user["user_id"])
+    elif current_user["role"] != "Admin":
+        raise HTTPException(status_code=403, detail="Not allowed to view archived enrollments.")
+
+    rows = query.order_by(enrollments.course_id, enrollments.student_id).offset(offset).limit(limit)
+    return [dict(row._mapping) for row in rows]
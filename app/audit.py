@@ -0,0 +1,121 @@
+import threading
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert
+from .config import AUDIT_BATCH_SIZE, AUDIT_FLUSH_SECONDS, AUDIT_MAX_BUFFER
+from .database import SessionLocal
+from .model import AuditEvent
+from .logger import logger
+
+
+class AuditBuffer:
+    """Collects audit events in memory and writes them in batches from a background thread.
+
+    A batch is flushed when batch_size events are waiting or every flush_interval seconds,
+    so recording an event never adds a commit to the request. A batch that fails to write
+    goes back to the front of the buffer and is retried on the next flush. Events still
+    buffered are flushed on stop(). Events that have to be discarded (buffer full, or a
+    failed write on stop) are logged with all their fields so they can be recovered.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._events = deque()
+        self._stopping = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def record(self, actor_id: int, action: str, target_type: str = None, target_id: int = None, detail: str = None):
+        event = {
+            "actor_id": actor_id,
+            "action": action,
+            "target_type": target_type,
+            "target_id": target_id,
+            "detail": detail[:255] if detail else detail,
+            "created_at": datetime.utcnow()
+        }
+        lost = None
+        with self._condition:
+            if len(self._events) >= self.max_buffer:
+                lost = self._events.popleft()
+            self._events.append(event)
+            if len(self._events) >= self.batch_size:
+                self._condition.notify()
+        if lost is not None:
+            _log_lost([lost], "audit buffer full")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self._thread.join()
+            self._thread = None
+        self.flush(requeue=False)
+
+    def flush(self, requeue: bool = True) -> bool:
+        """Write the buffered events; returns False if the write failed."""
+        with self._condition:
+            batch = list(self._events)
+            self._events.clear()
+        if not batch or self._write(batch):
+            return True
+        if requeue:
+            self._requeue(batch)
+        else:
+            _log_lost(batch, "write failed on shutdown")
+        return False
+
+    def _requeue(self, batch: list):
+        # The failed batch is older than anything recorded since, so it goes back in front;
+        # past max_buffer its oldest events are the ones discarded
+        with self._condition:
+            cut = max(len(batch) - (self.max_buffer - len(self._events)), 0)
+            lost, kept = batch[:cut], batch[cut:]
+            self._events.extendleft(reversed(kept))
+        if lost:
+            _log_lost(lost, "audit buffer full after a failed write")
+
+    def _run(self):
+        retrying = False
+        while True:
+            with self._condition:
+                # After a failed write wait the full interval instead of retrying at once
+                self._condition.wait_for(
+                    lambda: self._stopping or (not retrying and len(self._events) >= self.batch_size),
+                    timeout=self.flush_interval
+                )
+                stopping = self._stopping
+            if stopping:
+                return
+            retrying = not self.flush()
+
+    def _write(self, batch: list) -> bool:
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditEvent), batch)
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write {len(batch)} audit event(s), will retry: {e}")
+            return False
+        finally:
+            db.close()
+
+
+def _log_lost(events: list, reason: str):
+    for event in events:
+        logger.error(f"Audit event discarded ({reason}): {dict(event, created_at=event['created_at'].isoformat())}")
+
+
+audit_log = AuditBuffer(AUDIT_BATCH_SIZE, AUDIT_FLUSH_SECONDS, AUDIT_MAX_BUFFER)
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..model import User, AuthSession
+from ..schemas import RefreshRequest
+from ..security import oauth2_scheme, authenticate_user, issue_tokens, decode_token, create_access_token, revocation_store
+from ..logger import logger
+
+router = APIRouter()
+
+# Single login for every role; the token carries the user's actual role
+@router.post("/login")
+def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
+    user = authenticate_user(request, db, form_data.username, form_data.password)
+    tokens = issue_tokens(db, user.user_id, user.role.role_name)
+
+    logger.info(f"{user.role.role_name} login successful: {user.email}")
+    tokens["role"] = user.role.role_name
+    return tokens
+
+
+@router.post("/refresh")
+def refresh_access_token(payload: RefreshRequest, db: Session = Depends(get_db)):
+    claims = decode_token(payload.refresh_token, "refresh")
+
+    session = db.query(AuthSession).filter(AuthSession.session_id == claims.get("jti")).first()
+    if not session or session.revoked_at is not None:
+        raise HTTPException(status_code=401, detail="Session has been revoked.")
+
+    user = db.query(User).filter(User.user_id == claims["user_id"]).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    access_token = create_access_token(
+        data={"user_id": user.user_id, "role": user.role.role_name, "jti": session.session_id}
+    )
+
+    logger.info(f"Access token refreshed for user {user.user_id}")
+    return {
+        "access_token": access_token,
+        "token_type": "bearer"
+    }
+
+
+@router.post("/logout")
+def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    claims = decode_token(token, "access")
+    if "jti" in claims:
+        revocation_store.revoke(db, [claims["jti"]])
+
+    logger.info(f"User {claims['user_id']} logged out")
+    return {"message": "Logged out successfully"}
@@ -0,0 +1,17 @@
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from .model import EnrollmentTombstone, student_courses
+
+
+def record_enrollment_tombstones(db: Session, condition):
+    """Copy the enrollments matching condition into enrollment_tombstones.
+
+    Call in the same transaction, right before a delete that removes them through
+    ON DELETE CASCADE; a single INSERT ... SELECT regardless of row count.
+    """
+    db.execute(
+        insert(EnrollmentTombstone).from_select(
+            ["student_id", "course_id"],
+            select(student_courses.c.student_id, student_courses.c.course_id).where(condition)
+        )
+    )
@@ -4,6 +4,68 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Set to "false" in production and run `python -m app.init_db` once per deploy instead
+CREATE_SCHEMA_ON_STARTUP = os.getenv("CREATE_SCHEMA_ON_STARTUP", "true").lower() == "true"
 SECRET_KEY = os.getenv("SECRET_KEY")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
 
+# Response serialization and compression
+JSON_RESPONSE_CLASS = os.getenv("JSON_RESPONSE_CLASS", "orjson")
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "br,gzip")
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+# Certificate rendering backend: "html" (jinja2 + xhtml2pdf) or "canvas" (direct reportlab drawing)
+CERTIFICATE_RENDERER = os.getenv("CERTIFICATE_RENDERER", "html")
+CERTIFICATE_BACKGROUND = os.getenv("CERTIFICATE_BACKGROUND")
+# Optional directory with regular.ttf, bold.ttf and italic.ttf for the canvas renderer
+CERTIFICATE_FONT_DIR = os.getenv("CERTIFICATE_FONT_DIR")
+
+# Server-Sent Events change feed
+CHANGE_FEED_HISTORY = int(os.getenv("CHANGE_FEED_HISTORY", "1000"))
+CHANGE_FEED_SUBSCRIBER_BUFFER = int(os.getenv("CHANGE_FEED_SUBSCRIBER_BUFFER", "100"))
+CHANGE_FEED_HEARTBEAT_SECONDS = int(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+# Lifetime of the ?ticket= tokens that let browser EventSource clients open the stream
+CHANGE_FEED_TICKET_SECONDS = int(os.getenv("CHANGE_FEED_TICKET_SECONDS", "60"))
+
+# Login rate limiting ("memory" or "sqlite:///path/to/ratelimit.db" to share state across workers)
+LOGIN_RATE_LIMIT_BACKEND = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "memory")
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "10"))
+LOGIN_IP_PER_MINUTE = int(os.getenv("LOGIN_IP_PER_MINUTE", "20"))
+LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", "5"))
+LOGIN_EMAIL_PER_MINUTE = int(os.getenv("LOGIN_EMAIL_PER_MINUTE", "5"))
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+LOGIN_FAILURE_WINDOW_SECONDS = int(os.getenv("LOGIN_FAILURE_WINDOW_SECONDS", "900"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Idempotency-Key support for write endpoints ("memory" or "sqlite:///path/to/idempotency.db")
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "memory")
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# How long a key stays claimed by a request that has not finished (e.g. its worker died)
+IDEMPOTENCY_PENDING_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_LEASE_SECONDS", "60"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", "65536"))
+
+# Rows fetched per batch by the streaming CSV/Parquet exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "10000"))
+
+# Delta exports re-read this far before `since` to catch rows committed after the last watermark
+DELTA_EXPORT_OVERLAP_SECONDS = int(os.getenv("DELTA_EXPORT_OVERLAP_SECONDS", "60"))
+
+# Bulk course catalog import
+COURSE_IMPORT_MAX_ROWS = int(os.getenv("COURSE_IMPORT_MAX_ROWS", "5000"))
+
+# On-demand request profiling (Admin requests carrying PROFILE_HEADER, or a sampled fraction)
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_ENTRIES = int(os.getenv("PROFILE_MAX_ENTRIES", "50"))
+
+# Audit trail buffering
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "2"))
+AUDIT_MAX_BUFFER = int(os.getenv("AUDIT_MAX_BUFFER", "10000"))
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from .config import CHANGE_FEED_HISTORY, CHANGE_FEED_SUBSCRIBER_BUFFER
+
+
+class Subscriber:
+    """One SSE connection: a bounded queue filled from publisher threads via the event loop."""
+
+    def __init__(self, loop, max_buffer: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_buffer)
+        self.overflowed = False
+
+    def push(self, event: dict):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: dict):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: stop buffering; the stream closes and the client resumes from its last id
+            self.overflowed = True
+
+
+class ChangeFeed:
+    """In-process publish/subscribe of course and enrollment changes.
+
+    Recent events are kept in a bounded history so reconnecting clients can resume
+    from Last-Event-ID. Ids restart when the process restarts.
+    """
+
+    def __init__(self, history_size: int, subscriber_buffer: int):
+        self.subscriber_buffer = subscriber_buffer
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, course_id: int, instructor_id: int = None, student_id: int = None, **data):
+        with self._lock:
+            event = {
+                "id": self._next_id,
+                "type": event_type,
+                "course_id": course_id,
+                "instructor_id": instructor_id,
+                "student_id": student_id,
+                "data": data,
+                "at": datetime.utcnow().isoformat()
+            }
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            subscriber.push(event)
+
+    def subscribe(self, loop, last_event_id: int = None):
+        """Register a subscriber.
+
+        Returns the subscriber, the events published after last_event_id, and whether
+        some of those events already fell out of the history or last_event_id is from an
+        earlier process (either way the client must refetch).
+        """
+        subscriber = Subscriber(loop, self.subscriber_buffer)
+        with self._lock:
+            backlog = []
+            gap = False
+            if last_event_id is not None and last_event_id >= self._next_id:
+                # An id we never issued comes from before a restart: the client must refetch
+                gap = True
+            elif last_event_id is not None:
+                backlog = [event for event in self._history if event["id"] > last_event_id]
+                gap = bool(self._history) and self._history[0]["id"] > last_event_id + 1
+            self._subscribers.add(subscriber)
+        return subscriber, backlog, gap
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+
+change_feed = ChangeFeed(CHANGE_FEED_HISTORY, CHANGE_FEED_SUBSCRIBER_BUFFER)
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..config import CHANGE_FEED_HEARTBEAT_SECONDS, CHANGE_FEED_TICKET_SECONDS
+from ..database import SessionLocal
+from ..events import change_feed
+from ..model import student_courses
+from ..security import get_stream_user, create_stream_ticket, oauth2_scheme, verify_access_token
+from ..logger import logger
+
+router = APIRouter()
+
+
+def _enrolled_course_ids(student_id: int) -> set:
+    db = SessionLocal()
+    try:
+        rows = db.query(student_courses.c.course_id).filter(student_courses.c.student_id == student_id).all()
+        return {row.course_id for row in rows}
+    finally:
+        db.close()
+
+
+def _is_visible(event: dict, current_user: dict, course_ids: set) -> bool:
+    role = current_user["role"]
+    if role == "Admin":
+        return True
+    if role == "Teacher":
+        return event["instructor_id"] == current_user["user_id"]
+    if role == "Student":
+        # Students see their own enrollments and the course-level changes of courses they are in
+        if event["type"].startswith("enrollment_"):
+            if event["student_id"] != current_user["user_id"]:
+                return False
+            if event["type"] == "enrollment_deleted":
+                course_ids.discard(event["course_id"])
+            else:
+                course_ids.add(event["course_id"])
+            return True
+        if event["type"] in ("course_updated", "course_deleted") and event["course_id"] in course_ids:
+            if event["type"] == "course_deleted":
+                course_ids.discard(event["course_id"])
+            return True
+    return False
+
+
+def _format_event(event: dict) -> str:
+    data = {key: event[key] for key in ("course_id", "instructor_id", "student_id", "data", "at")}
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/ticket")
+def create_ticket(token: str = Depends(oauth2_scheme)):
+    """Short-lived ticket for /events/stream?ticket=..., for browser EventSource clients.
+
+    EventSource cannot send an Authorization header. Fetch a new ticket before reconnecting
+    once it has expired; fetch-based SSE clients can send the bearer token instead.
+    """
+    return {"ticket": create_stream_ticket(verify_access_token(token)), "expires_in": CHANGE_FEED_TICKET_SECONDS}
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+    current_user: dict = Depends(get_stream_user)
+):
+    """Server-Sent Events of course and enrollment changes visible to the caller.
+
+    Authenticate with the bearer token, or with ?ticket= from POST /events/ticket.
+    """
+    course_ids = set()
+    if current_user["role"] == "Student":
+        course_ids = await run_in_threadpool(_enrolled_course_ids, current_user["user_id"])
+
+    subscriber, backlog, gap = change_feed.subscribe(asyncio.get_running_loop(), last_event_id)
+    logger.info(f"Change feed subscribed by user {current_user['user_id']} (last_event_id={last_event_id})")
+
+    async def event_stream():
+        try:
+            if gap:
+                yield "event: reset\ndata: {}\n\n"
+            for event in backlog:
+                if _is_visible(event, current_user, course_ids):
+                    yield _format_event(event)
+
+            while not await request.is_disconnected():
+                if subscriber.overflowed and subscriber.queue.empty():
+                    logger.warning(f"Change feed subscriber {current_user['user_id']} fell behind, closing stream")
+                    return
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=CHANGE_FEED_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if _is_visible(event, current_user, course_ids):
+                    yield _format_event(event)
+        finally:
+            change_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,14 +1,14 @@
 import os
+from ..audit import audit_log
 from ..logger import logger
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader
-from xhtml2pdf import pisa
 from ..database import get_db
 from ..security import get_current_user
 from ..model import User, Course
+from .certificate_renderers import get_certificate_renderer
 
 # Configure router
 router = APIRouter()
@@ -43,9 +43,7 @@ def generate_certificate(
         raise HTTPException(status_code=400, detail="Student not enrolled in this course")
 
     try:
-        env = Environment(loader=FileSystemLoader("templates"))
-        template = env.get_template("certificate_templates.html")
-        html_content = template.render(
+        pdf_content = get_certificate_renderer().render(
             student_name=student.full_name,
             course_title=course.course_title,
             instructor_name=teacher.full_name,
@@ -53,19 +51,17 @@ def generate_certificate(
         )
         logger.info(f"Certificate generated successfully for student '{student.full_name}'")
     except Exception as e:
-        logger.error(f"Template rendering failed: {e}")
-        raise HTTPException(status_code=500, detail="Error rendering certificate")
+        logger.error(f"Certificate rendering failed: {e}")
+        raise HTTPException(status_code=500, detail="Error generating PDF")
 
     os.makedirs("certificates", exist_ok=True)
     output_path = f"certificates/certificate_{student_id}_{course_id}.pdf"
 
     try:
-        with open(output_path, "w+b") as pdf_file:
-            pisa_status = pisa.CreatePDF(html_content, dest=pdf_file)
-        if pisa_status.err:
-            logger.error("PDF generation failed due to rendering error")
-            raise HTTPException(status_code=500, detail="Error generating PDF")
+        with open(output_path, "wb") as pdf_file:
+            pdf_file.write(pdf_content)
         logger.info(f"PDF certificate successfully generated at '{output_path}'")
+        audit_log.record(teacher.user_id, "certificate.issue", "user", student_id, f"course_id={course_id}")
     except Exception as e:
         logger.error(f"PDF generation exception: {e}")
         raise HTTPException(status_code=500, detail="Error generating PDF")
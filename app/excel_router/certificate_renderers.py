@@ -0,0 +1,138 @@
+import io
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from ..config import CERTIFICATE_RENDERER, CERTIFICATE_BACKGROUND, CERTIFICATE_FONT_DIR
+from ..logger import logger
+
+
+class CertificateRenderer(ABC):
+    """Turns certificate fields into PDF bytes. Expensive setup belongs in __init__."""
+
+    name = None
+
+    @abstractmethod
+    def render(self, student_name: str, course_title: str, instructor_name: str, date: str) -> bytes:
+        ...
+
+
+class HtmlCertificateRenderer(CertificateRenderer):
+    """Renders templates/certificate_templates.html with jinja2 and converts it with xhtml2pdf."""
+
+    name = "html"
+
+    def __init__(self, template_dir: str = "templates", template_name: str = "certificate_templates.html"):
+        from jinja2 import Environment, FileSystemLoader
+        from xhtml2pdf import pisa
+
+        self._pisa = pisa
+        self._template = Environment(loader=FileSystemLoader(template_dir)).get_template(template_name)
+
+    def render(self, student_name, course_title, instructor_name, date):
+        html_content = self._template.render(
+            student_name=student_name,
+            course_title=course_title,
+            instructor_name=instructor_name,
+            date=date
+        )
+        buffer = io.BytesIO()
+        pisa_status = self._pisa.CreatePDF(html_content, dest=buffer)
+        if pisa_status.err:
+            raise RuntimeError("xhtml2pdf failed to render the certificate")
+        return buffer.getvalue()
+
+
+class CanvasCertificateRenderer(CertificateRenderer):
+    """Draws the fixed certificate layout straight onto a reportlab canvas.
+
+    Fonts are registered and the background image decoded once, then reused by every render.
+    """
+
+    name = "canvas"
+
+    TAN = (0.824, 0.706, 0.549)
+    PAGE_SIZE = (842, 595)  # A4 landscape, in points
+    BORDER = 20
+
+    def __init__(self, background_path: str = CERTIFICATE_BACKGROUND, font_dir: str = CERTIFICATE_FONT_DIR):
+        from reportlab.pdfgen import canvas
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.lib.utils import ImageReader
+
+        self._canvas = canvas
+        self._string_width = pdfmetrics.stringWidth
+        self.fonts = {"regular": "Times-Roman", "bold": "Times-Bold", "italic": "Times-Italic"}
+
+        if font_dir:
+            for style in self.fonts:
+                path = os.path.join(font_dir, f"{style}.ttf")
+                if os.path.exists(path):
+                    font_name = f"Certificate-{style}"
+                    pdfmetrics.registerFont(TTFont(font_name, path))
+                    self.fonts[style] = font_name
+
+        self.background = ImageReader(background_path) if background_path else None
+
+    def _draw_centred_runs(self, pdf, y: float, runs: list, size: int):
+        # runs is a list of (text, style) drawn side by side, centred as one line
+        width = sum(self._string_width(text, self.fonts[style], size) for text, style in runs)
+        x = (self.PAGE_SIZE[0] - width) / 2
+        for text, style in runs:
+            pdf.setFont(self.fonts[style], size)
+            pdf.drawString(x, y, text)
+            x += self._string_width(text, self.fonts[style], size)
+
+    def render(self, student_name, course_title, instructor_name, date):
+        page_width, page_height = self.PAGE_SIZE
+        centre = page_width / 2
+        buffer = io.BytesIO()
+        pdf = self._canvas.Canvas(buffer, pagesize=self.PAGE_SIZE, pageCompression=1)
+
+        if self.background is not None:
+            pdf.drawImage(self.background, 0, 0, width=page_width, height=page_height)
+
+        pdf.setStrokeColorRGB(*self.TAN)
+        pdf.setLineWidth(self.BORDER)
+        pdf.rect(self.BORDER / 2, self.BORDER / 2, page_width - self.BORDER, page_height - self.BORDER)
+
+        pdf.setFillColorRGB(*self.TAN)
+        pdf.setFont(self.fonts["regular"], 48)
+        pdf.drawCentredString(centre, 450, "Certificate of Completion")
+
+        pdf.setFillColorRGB(0, 0, 0)
+        pdf.setFont(self.fonts["regular"], 24)
+        pdf.drawCentredString(centre, 385, "This certificate is presented to")
+
+        pdf.setFont(self.fonts["italic"], 32)
+        pdf.drawCentredString(centre, 320, student_name)
+        pdf.setLineWidth(2)
+        pdf.setStrokeColorRGB(0, 0, 0)
+        pdf.line(centre - 200, 308, centre + 200, 308)
+
+        pdf.setFont(self.fonts["regular"], 24)
+        pdf.drawCentredString(centre, 250, "For successfully completing the course")
+        self._draw_centred_runs(pdf, 218, [(course_title, "bold")], 24)
+        self._draw_centred_runs(pdf, 186, [("under the instruction of ", "regular"), (instructor_name, "bold")], 24)
+        pdf.setFont(self.fonts["regular"], 24)
+        pdf.drawCentredString(centre, 130, f"Date: {date}")
+
+        pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+
+RENDERERS = {
+    HtmlCertificateRenderer.name: HtmlCertificateRenderer,
+    CanvasCertificateRenderer.name: CanvasCertificateRenderer,
+}
+
+
+@lru_cache(maxsize=None)
+def get_certificate_renderer(name: str = CERTIFICATE_RENDERER) -> CertificateRenderer:
+    renderer_class = RENDERERS.get(name)
+    if renderer_class is None:
+        logger.warning(f"Unknown certificate renderer '{name}', using 'html'")
+        renderer_class = HtmlCertificateRenderer
+    logger.info(f"Certificate renderer initialised: {renderer_class.name}")
+    return renderer_class()
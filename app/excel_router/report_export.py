@@ -1,15 +1,38 @@
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
-from openpyxl import Workbook
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..model import User
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import Session, aliased
+from starlette.background import BackgroundTask
+from ..config import EXPORT_BATCH_SIZE, DELTA_EXPORT_OVERLAP_SECONDS
+from ..database import get_db, SessionLocal
+from ..model import User, Role, Course, Department, EnrollmentTombstone, student_courses
 from ..security import get_current_user
 from ..logger import logger
 
 # Initialize router
 router = APIRouter()
 
+Instructor = aliased(User)
+
+# Exportable enrollment columns: name -> (SQL expression, Arrow type name)
+EXPORT_COLUMNS = {
+    "student_id": (User.user_id, "int64"),
+    "student_name": (User.full_name, "string"),
+    "email": (User.email, "string"),
+    "course_id": (Course.course_id, "int64"),
+    "course_code": (Course.course_code, "string"),
+    "course": (Course.course_title, "string"),
+    "credits": (Course.credits, "int64"),
+    "department": (Department.department_name, "string"),
+    "instructor": (Instructor.full_name, "string"),
+}
+
 @router.get("/export/students/excel")
 def export_students_excel(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     logger.info(f"User '{current_user['username']}' with role '{current_user['role']}' requested student Excel export")
@@ -20,6 +43,8 @@ def export_students_excel(db: Session = Depends(get_db), current_user: dict = De
 
     students = db.query(User).filter(User.role.has(role_name="Student")).all()
 
+    from openpyxl import Workbook
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Students"
@@ -44,3 +69,177 @@ def export_students_excel(db: Session = Depends(get_db), current_user: dict = De
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         filename=file_path
     )
+
+
+def _export_columns(columns: Optional[str]):
+    if not columns:
+        return list(EXPORT_COLUMNS)
+    names = [name.strip() for name in columns.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown export column(s): {', '.join(unknown)}. Available: {', '.join(EXPORT_COLUMNS)}"
+        )
+    return names
+
+
+def _enrollment_query(names: list, department_id: Optional[int], course_id: Optional[int]):
+    # One flat row per enrollment; only the projected columns are selected
+    query = (
+        select(*[EXPORT_COLUMNS[name][0].label(name) for name in names])
+        .select_from(student_courses)
+        .join(User, User.user_id == student_courses.c.student_id)
+        .join(Role, Role.role_id == User.role_id)
+        .join(Course, Course.course_id == student_courses.c.course_id)
+        .outerjoin(Department, Department.department_id == Course.department_id)
+        .outerjoin(Instructor, Instructor.user_id == Course.instructor_id)
+        .where(Role.role_name == "Student")
+        .order_by(student_courses.c.student_id, student_courses.c.course_id)
+    )
+    if department_id is not None:
+        query = query.where(Course.department_id == department_id)
+    if course_id is not None:
+        query = query.where(Course.course_id == course_id)
+    return query
+
+
+def _enrollment_batches(query):
+    # Own session: the stream outlives the request's dependency-scoped session
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(stream_results=True, max_row_buffer=EXPORT_BATCH_SIZE))
+        for batch in result.partitions(EXPORT_BATCH_SIZE):
+            yield batch
+    finally:
+        db.close()
+
+
+def _check_export_access(current_user: dict, export_type: str):
+    logger.info(f"User '{current_user['username']}' with role '{current_user['role']}' requested student {export_type} export")
+
+    if current_user["role"] != "Admin":
+        logger.warning(f"Unauthorized export attempt by user '{current_user['username']}'")
+        raise HTTPException(status_code=403, detail="Admins only")
+
+
+@router.get("/export/students/csv")
+def export_students_csv(
+    columns: Optional[str] = None,
+    department_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    _check_export_access(current_user, "CSV")
+    names = _export_columns(columns)
+    query = _enrollment_query(names, department_id, course_id)
+
+    def csv_stream():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        for batch in _enrollment_batches(query):
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue()
+
+    return StreamingResponse(
+        csv_stream(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="student_report.csv"'}
+    )
+
+
+@router.get("/export/students/parquet")
+def export_students_parquet(
+    columns: Optional[str] = None,
+    department_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    _check_export_access(current_user, "Parquet")
+    names = _export_columns(columns)
+    query = _enrollment_query(names, department_id, course_id)
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.error("Parquet export requested but pyarrow is not installed")
+        raise HTTPException(status_code=501, detail="Parquet export is not available")
+
+    schema = pa.schema([(name, getattr(pa, EXPORT_COLUMNS[name][1])()) for name in names])
+    fd, file_path = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+
+    try:
+        with pq.ParquetWriter(file_path, schema, compression="zstd") as writer:
+            for batch in _enrollment_batches(query):
+                # Transpose the row batch into columns and write it as one row group
+                arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*batch), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        logger.info(f"Parquet export written to '{file_path}'")
+    except Exception as e:
+        os.remove(file_path)
+        logger.error(f"Failed to write Parquet export: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate Parquet report")
+
+    return FileResponse(
+        file_path,
+        media_type="application/vnd.apache.parquet",
+        filename="student_report.parquet",
+        background=BackgroundTask(os.remove, file_path)
+    )
+
+
+@router.get("/export/students/delta")
+def export_students_delta(
+    since: datetime,
+    columns: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Enrollment rows changed after `since`, plus enrollments deleted after it.
+
+    Pass the returned watermark as `since` on the next run. Timestamps have coarse resolution
+    and a transaction can commit after the watermark was read with an earlier timestamp, so
+    each run also re-reads the DELTA_EXPORT_OVERLAP_SECONDS before `since`: rows near the
+    boundary are returned twice, and consumers apply them by (student_id, course_id) key.
+    """
+    _check_export_access(current_user, "delta")
+    names = _export_columns(columns)
+
+    # Database clock, the same one that fills created_at/updated_at
+    watermark = db.execute(select(func.now())).scalar()
+    lower_bound = since - timedelta(seconds=DELTA_EXPORT_OVERLAP_SECONDS)
+
+    # Each branch is driven by an indexed timestamp, so cost follows the number of changes
+    changed_courses = select(Course.course_id).where(or_(
+        Course.updated_at > lower_bound,
+        Course.department_id.in_(select(Department.department_id).where(Department.updated_at > lower_bound)),
+        Course.instructor_id.in_(select(User.user_id).where(User.updated_at > lower_bound))
+    ))
+    changed_students = select(User.user_id).where(User.updated_at > lower_bound)
+
+    query = _enrollment_query(names, None, None).where(
+        student_courses.c.created_at <= watermark,
+        or_(
+            student_courses.c.created_at > lower_bound,
+            student_courses.c.course_id.in_(changed_courses),
+            student_courses.c.student_id.in_(changed_students)
+        )
+    )
+    upserts = [dict(row._mapping) for row in db.execute(query)]
+
+    deletes = [
+        {"student_id": row.student_id, "course_id": row.course_id, "deleted_at": row.deleted_at}
+        for row in db.query(EnrollmentTombstone).filter(
+            EnrollmentTombstone.deleted_at > lower_bound,
+            EnrollmentTombstone.deleted_at <= watermark
+        ).order_by(EnrollmentTombstone.deleted_at)
+    ]
+
+    logger.info(f"Delta export since {since}: {len(upserts)} changed, {len(deletes)} deleted enrollment(s)")
+    return {"since": since, "watermark": watermark, "upserts": upserts, "deletes": deletes}
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from .config import (
+    IDEMPOTENCY_STORE, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_PENDING_LEASE_SECONDS,
+    IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_MAX_BODY_BYTES
+)
+from .logger import logger
+
+IDEMPOTENT_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+class MemoryStore:
+    """Per-process store of (fingerprint, status, headers, body), LRU-bounded with TTL eviction.
+
+    A status of None marks a request that is still being handled; that claim only lasts
+    pending_lease seconds, so a key whose request never finished becomes usable again.
+    """
+
+    def __init__(self, ttl: int, max_keys: int, pending_lease: int):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.pending_lease = pending_lease
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, fingerprint: str):
+        """Return the existing record for key, or claim the key and return None."""
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > now:
+                return item[1]
+            self._items[key] = (now + self.pending_lease, (fingerprint, None, [], b""))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_keys:
+                self._items.popitem(last=False)
+        return None
+
+    def complete(self, key: str, fingerprint: str, status: int, headers: list, body: bytes):
+        with self._lock:
+            self._items[key] = (time.time() + self.ttl, (fingerprint, status, headers, body))
+
+    def release(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+
+class SQLiteStore:
+    """Same records kept in a SQLite file so retries landing on another worker are replayed."""
+
+    def __init__(self, path: str, ttl: int, max_keys: int, pending_lease: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.pending_lease = pending_lease
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, expires REAL, fingerprint TEXT, status INTEGER, headers TEXT, body BLOB)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, key: str, fingerprint: str):
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT fingerprint, status, headers, body FROM responses WHERE key = ? AND expires > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires, fingerprint, status, headers, body) "
+                    "VALUES (?, ?, ?, NULL, '[]', x'')",
+                    (key, now + self.pending_lease, fingerprint)
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                    (self.max_keys,)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return row[0], row[1], [tuple(h) for h in json.loads(row[2])], row[3]
+
+    def complete(self, key: str, fingerprint: str, status: int, headers: list, body: bytes):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO responses (key, expires, fingerprint, status, headers, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, time.time() + self.ttl, fingerprint, status, json.dumps(headers), body)
+        )
+
+    def release(self, key: str):
+        self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+def _create_store(url: str):
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///"):], IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS,
+                           IDEMPOTENCY_PENDING_LEASE_SECONDS)
+    if url != "memory":
+        logger.warning(f"Unknown idempotency store '{url}', using in-memory store")
+    return MemoryStore(IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_PENDING_LEASE_SECONDS)
+
+
+class IdempotencyMiddleware:
+    """Replays the stored response for write requests that repeat an Idempotency-Key header.
+
+    Keys are scoped to the caller's Authorization header, and a key reused with a
+    different method, path or body is rejected instead of replayed.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store or _create_store(IDEMPOTENCY_STORE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in IDEMPOTENT_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        key = hashlib.sha256(f"{headers.get('authorization', '')}\n{idempotency_key}".encode()).hexdigest()
+        fingerprint = hashlib.sha256(
+            scope["method"].encode() + b" " + scope["path"].encode() + b"?" + scope["query_string"] + b"\n" + body
+        ).hexdigest()
+
+        record = self.store.reserve(key, fingerprint)
+        if record is not None:
+            await self._replay(record, fingerprint, scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response = {"status": None, "headers": [], "body": b"", "cacheable": True}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    (k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body" and response["cacheable"]:
+                response["body"] += message.get("body", b"")
+                if len(response["body"]) > IDEMPOTENCY_MAX_BODY_BYTES:
+                    response["cacheable"] = False
+                    response["body"] = b""
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            # Includes cancellation when the client disconnects, so the key is not left pending
+            self.store.release(key)
+            raise
+
+        if response["status"] is not None and response["status"] < 500 and response["cacheable"]:
+            self.store.complete(key, fingerprint, response["status"], response["headers"], response["body"])
+        else:
+            self.store.release(key)
+
+    async def _replay(self, record, fingerprint, scope, receive, send):
+        stored_fingerprint, status, headers, body = record
+
+        if stored_fingerprint != fingerprint:
+            error = JSONResponse(status_code=422, content={"detail": "Idempotency-Key was already used for a different request."})
+        elif status is None:
+            error = JSONResponse(status_code=409, content={"detail": "A request with this Idempotency-Key is still in progress."})
+        else:
+            error = None
+
+        if error is not None:
+            await error(scope, receive, send)
+            return
+
+        raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        raw_headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,23 @@
+"""Create the database schema outside the request-serving process.
+
+Run once per deploy with ``python -m app.init_db`` and start the workers with
+CREATE_SCHEMA_ON_STARTUP=false. Existing databases are upgraded in place: columns
+added since they were created are added and backfilled (see app/migrations.py).
+"""
+from .database import Base, engine
+from . import model  # noqa: F401  (registers the tables on Base.metadata)
+from .migrations import upgrade_schema
+from .search import ensure_search_index
+from .logger import logger
+
+
+def init_db():
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    ensure_search_index(engine)
+    logger.info("Database schema created")
+
+
+if __name__ == "__main__":
+    init_db()
+    print(" tables created")
@@ -1,23 +1,49 @@
 from fastapi import FastAPI
+from .config import CREATE_SCHEMA_ON_STARTUP
 from .database import Base, engine
-from .admin_router import auth, department
+from .responses import CompressionMiddleware, json_response_class
+from .idempotency import IdempotencyMiddleware
+from .profiling import ProfilingMiddleware, install_sql_capture
+from .admin_router import auth, department, term, profiles, audit
 from .teacher_router import teacher_auth,course,student_crud
 from .student_router import student_auth,student_course
 from .excel_router import report_export,certificate
+from .auth_router import session
+from .search_router import search
+from .events_router import events
+from .archive_router import archive
+from .migrations import upgrade_schema
+from .search import ensure_search_index
+from .audit import audit_log
 
 from . import model
 
-app = FastAPI(title="Student Management System")
+app = FastAPI(title="Student Management System", default_response_class=json_response_class())
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+install_sql_capture(engine)
 
 @app.on_event("startup")
 def on_startup():
-    print(" tables created")
-    Base.metadata.create_all(bind=engine)
+    if CREATE_SCHEMA_ON_STARTUP:
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        ensure_search_index(engine)
+        print(" tables created")
+    audit_log.start()
 
+@app.on_event("shutdown")
+def on_shutdown():
+    audit_log.stop()
 
 
+app.include_router(session.router, tags=["Session"])
 app.include_router(auth.router, prefix="/admin", tags=["Admin Auth"])
 app.include_router(department.router, prefix="/admin", tags=["Department Management"])
+app.include_router(term.router, prefix="/admin", tags=["Term Management"])
+app.include_router(profiles.router, prefix="/admin", tags=["Profiling"])
+app.include_router(audit.router, prefix="/admin", tags=["Audit Log"])
 app.include_router(teacher_auth.router,prefix="/teacher",tags=["Teacher auth"])
 app.include_router(course.router,prefix="/teacher",tags=["Courses"])
 app.include_router(student_crud.router,prefix="/teacher",tags=["Students CRUD"])
@@ -25,6 +51,9 @@ app.include_router(student_auth.router,prefix="/student",tags=["Student auth"])
 app.include_router(student_course.router,prefix="/student",tags=["view Course"])
 app.include_router(report_export.router, prefix="/reports", tags=["Report Export"])
 app.include_router(certificate.router, prefix="/reports", tags=["Course Completion"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(events.router, prefix="/events", tags=["Change Feed"])
+app.include_router(archive.router, prefix="/archive", tags=["Archive"])
 
 
 @app.get("/")
@@ -0,0 +1,82 @@
+"""Bring databases created by an earlier release up to the current model.
+
+``Base.metadata.create_all`` only creates missing tables, so columns and indexes added
+to existing tables are added here. Every step checks the live schema first, which
+makes this safe to run on every deploy; ``python -m app.init_db`` runs it right after
+``create_all``.
+"""
+from sqlalchemy import DateTime, inspect, text
+from .database import Base
+from .logger import logger
+
+# Change-tracking timestamps added to existing tables: (table, column, not null)
+TIMESTAMP_COLUMNS = [
+    ("users", "created_at", False),
+    ("users", "updated_at", False),
+    ("departments", "created_at", False),
+    ("departments", "updated_at", False),
+    ("courses", "updated_at", False),
+    ("student_courses", "created_at", True),
+]
+
+# Tables that gained a nullable term_id; existing rows belong to no term
+TERM_TABLES = ["courses", "student_courses"]
+
+
+def _add_timestamp_column(conn, table: str, column: str, not_null: bool):
+    if conn.dialect.name == "sqlite":
+        # SQLite cannot add a column with a non-constant default or add NOT NULL later;
+        # the model supplies the value on insert, so backfill the existing rows only
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} DATETIME"))
+        conn.execute(text(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP"))
+        return
+    # MySQL and PostgreSQL fill the existing rows with the default (the migration time)
+    column_type = DateTime().compile(dialect=conn.dialect)
+    null = "NOT NULL" if not_null else "NULL"
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type} {null} DEFAULT CURRENT_TIMESTAMP"))
+
+
+def _add_term_column(conn, table: str):
+    if conn.dialect.name == "mysql":
+        # MySQL ignores an inline REFERENCES clause, the constraint has to be added explicitly
+        conn.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN term_id INTEGER NULL, "
+            "ADD FOREIGN KEY (term_id) REFERENCES terms (term_id) ON DELETE SET NULL"
+        ))
+    else:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN term_id INTEGER REFERENCES terms (term_id) ON DELETE SET NULL"))
+
+
+def _create_missing_indexes(conn):
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+                logger.info(f"Schema upgrade: created index {index.name}")
+
+
+def upgrade_schema(engine):
+    """Add the columns and indexes that create_all does not add to existing tables."""
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        columns = {}
+        for table, column, not_null in TIMESTAMP_COLUMNS:
+            if table not in columns:
+                columns[table] = {col["name"] for col in inspector.get_columns(table)}
+            if column not in columns[table]:
+                _add_timestamp_column(conn, table, column, not_null)
+                logger.info(f"Schema upgrade: added {table}.{column}")
+
+        for table in TERM_TABLES:
+            if "term_id" not in {col["name"] for col in inspector.get_columns(table)}:
+                _add_term_column(conn, table)
+                logger.info(f"Schema upgrade: added {table}.term_id")
+
+        _create_missing_indexes(conn)
+
+    logger.info("Database schema is up to date")
+
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, func,Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, func,Date,Boolean,Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -7,9 +7,33 @@ student_courses = Table(
     "student_courses",
     Base.metadata,
     Column("student_id", ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True),
-    Column("course_id", ForeignKey("courses.course_id", ondelete="CASCADE"), primary_key=True)
+    Column("course_id", ForeignKey("courses.course_id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("created_at", DateTime, default=func.now(), server_default=func.now(), nullable=False, index=True),
+    Column("term_id", ForeignKey("terms.term_id", ondelete="SET NULL"), nullable=True, index=True)
 )
 
+# Enrollments of archived terms, moved out of student_courses by the archival job
+student_courses_archive = Table(
+    "student_courses_archive",
+    Base.metadata,
+    Column("student_id", Integer, primary_key=True),
+    Column("course_id", Integer, primary_key=True),
+    Column("term_id", Integer, primary_key=True),
+    Column("created_at", DateTime, nullable=True),
+    Column("archived_at", DateTime, server_default=func.now(), nullable=False)
+)
+
+# Academic term (semester/session) that courses and enrollments belong to
+class Term(Base):
+    __tablename__ = "terms"
+
+    term_id = Column(Integer, primary_key=True, index=True)
+    term_name = Column(String(50), unique=True, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    is_closed = Column(Boolean, default=False, nullable=False)
+    archived_at = Column(DateTime, nullable=True)
+
 # Role table (Student, Teacher, Admin, etc.)
 class Role(Base):
     __tablename__ = "roles"
@@ -28,12 +52,16 @@ class User(Base):
     password_hash = Column(String(255), nullable=False)
     date_of_birth = Column(Date, nullable=True)
 
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
+
     role_id = Column(Integer, ForeignKey("roles.role_id", ondelete="SET NULL"))
 
     role = relationship("Role", back_populates="users")
 
-    courses = relationship("Course", secondary=student_courses, back_populates="students")
-    instructed_courses = relationship("Course", back_populates="instructor", foreign_keys='Course.instructor_id')
+    # passive_deletes: the database's ON DELETE rules clean up, so collections are not loaded on delete
+    courses = relationship("Course", secondary=student_courses, back_populates="students", passive_deletes=True)
+    instructed_courses = relationship("Course", back_populates="instructor", foreign_keys='Course.instructor_id', passive_deletes=True)
 
 
 # Department table with a one-to-one relationship to head (User)
@@ -45,8 +73,11 @@ class Department(Base):
     department_name = Column(String(100), unique=True, nullable=False)
     head_user_id = Column(Integer, ForeignKey("users.user_id", ondelete="SET NULL"), unique=True, nullable=True)
 
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
+
     head = relationship("User", uselist=False, foreign_keys=[head_user_id])
-    courses = relationship("Course", back_populates="department", cascade="all, delete-orphan")
+    courses = relationship("Course", back_populates="department", cascade="all, delete-orphan", passive_deletes=True)
 
 
 # Course table
@@ -65,6 +96,62 @@ class Course(Base):
     department_id = Column(Integer, ForeignKey("departments.department_id", ondelete="CASCADE"), nullable=True)
     department = relationship("Department", back_populates="courses", passive_deletes=True)
 
+    term_id = Column(Integer, ForeignKey("terms.term_id", ondelete="SET NULL"), nullable=True, index=True)
+
     created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), index=True)
+
+    students = relationship("User", secondary=student_courses, back_populates="courses", passive_deletes=True)
+
+
+# Courses of archived terms; course_code is no longer unique here
+class CourseArchive(Base):
+    __tablename__ = "courses_archive"
+
+    course_id = Column(Integer, primary_key=True)
+    course_title = Column(String(100), nullable=False)
+    course_code = Column(String(20), nullable=False, index=True)
+    credits = Column(Integer, nullable=False)
+    instructor_id = Column(Integer, nullable=True, index=True)
+    department_id = Column(Integer, nullable=True)
+    term_id = Column(Integer, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+# Login session shared by an access/refresh token pair (the token "jti")
+class AuthSession(Base):
+    __tablename__ = "auth_sessions"
+
+    session_id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=True, index=True)
+
+
+# Record of an enrollment removed from student_courses, for incremental exports
+class EnrollmentTombstone(Base):
+    __tablename__ = "enrollment_tombstones"
+
+    tombstone_id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, nullable=False)
+    course_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
+
+# Structured record of a security-relevant action, written in batches by app.audit
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+
+    audit_id = Column(Integer, primary_key=True, index=True)
+    actor_id = Column(Integer, nullable=True)
+    action = Column(String(50), nullable=False)
+    target_type = Column(String(50), nullable=True)
+    target_id = Column(Integer, nullable=True)
+    detail = Column(String(255), nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
 
-    students = relationship("User", secondary=student_courses, back_populates="courses")
+    __table_args__ = (
+        Index("ix_audit_events_actor_created", "actor_id", "created_at"),
+        Index("ix_audit_events_action_created", "action", "created_at"),
+    )
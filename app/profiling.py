@@ -0,0 +1,193 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from collections import Counter
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from starlette.datastructures import Headers
+from .config import PROFILE_HEADER, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS, PROFILE_DIR, PROFILE_MAX_ENTRIES
+from .security import verify_access_token
+from .logger import logger
+
+# SQL statements of the request being profiled; copied into threadpool workers with the context
+_sql_log = ContextVar("profile_sql_log", default=None)
+
+# Innermost frames of threads that are just waiting for work
+IDLE_FRAMES = {("threading.py", "wait"), ("queue.py", "get"), ("selectors.py", "select"), ("thread.py", "_worker")}
+
+
+def install_sql_capture(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _sql_log.get() is not None:
+            conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log = _sql_log.get()
+        if log is not None and conn.info.get("profile_query_start"):
+            started = conn.info["profile_query_start"].pop()
+            log.append({"statement": statement, "duration_ms": round((time.perf_counter() - started) * 1000, 3)})
+
+
+class StackSampler:
+    """Samples the stacks of all busy threads, so sync endpoints in the threadpool are covered.
+
+    Output is in folded-stack format (flamegraph.pl / speedscope). Concurrent requests on
+    the same worker show up in the samples too.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """Bounded on-disk ring of profiles: the oldest files are removed past max_entries."""
+
+    ID_PATTERN = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        return f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+
+    def path(self, profile_id: str) -> str:
+        if not self.ID_PATTERN.match(profile_id):
+            raise ValueError("Invalid profile id")
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def ids(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted((name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")), reverse=True)
+
+    def save(self, profile: dict):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(profile["id"]), "w") as profile_file:
+                json.dump(profile, profile_file)
+            for old_id in self.ids()[self.max_entries:]:
+                os.remove(self.path(old_id))
+
+    def load(self, profile_id: str):
+        path = self.path(profile_id)
+        if not os.path.exists(path):
+            return None
+        with open(path) as profile_file:
+            return json.load(profile_file)
+
+
+profile_store = ProfileStore(PROFILE_DIR, PROFILE_MAX_ENTRIES)
+
+
+class ProfilingMiddleware:
+    """Profiles Admin requests that carry the profile header, plus a sampled fraction of all requests."""
+
+    def __init__(self, app, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self.header = PROFILE_HEADER.lower()
+
+    def _requested_by_admin(self, headers: Headers) -> bool:
+        if not headers.get(self.header):
+            return False
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            return verify_access_token(token)["role"] == "Admin"
+        except HTTPException:
+            return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        reason = None
+        # Token verification may sync revoked sessions from the database, so keep it off the event loop
+        if headers.get(self.header) and await run_in_threadpool(self._requested_by_admin, headers):
+            reason = "header"
+        elif PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            reason = "sampled"
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        status = {"code": None}
+
+        async def profiled_send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message.setdefault("headers", []).append((b"x-profile-id", profile_id.encode()))
+            await send(message)
+
+        sql_log = []
+        sql_token = _sql_log.set(sql_log)
+        sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, profiled_send)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            _sql_log.reset(sql_token)
+
+            profile = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode("latin-1"),
+                "status": status["code"],
+                "reason": reason,
+                "duration_ms": round(duration * 1000, 3),
+                "sql_count": len(sql_log),
+                "sql_ms": round(sum(query["duration_ms"] for query in sql_log), 3),
+                "sql": sql_log,
+                "folded_stacks": sampler.folded(),
+            }
+            try:
+                await run_in_threadpool(self.store.save, profile)
+                logger.info(f"Profiled {scope['method']} {scope['path']} ({reason}): {profile['duration_ms']} ms, id {profile_id}")
+            except OSError as e:
+                logger.error(f"Failed to store profile {profile_id}: {e}")
@@ -0,0 +1,190 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from .config import (
+    LOGIN_RATE_LIMIT_BACKEND, LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE, LOGIN_EMAIL_BURST,
+    LOGIN_EMAIL_PER_MINUTE, LOGIN_MAX_FAILURES, LOGIN_FAILURE_WINDOW_SECONDS, RATE_LIMIT_MAX_KEYS,
+)
+from .logger import logger
+
+
+class MemoryBackend:
+    """Per-process token buckets and sliding-window counters, LRU-bounded to max_keys."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _touch(self, table: OrderedDict, key: str, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_keys:
+            table.popitem(last=False)
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token; returns 0 if allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            if tokens >= 1:
+                self._touch(self._buckets, key, (tokens - 1, now))
+                return 0
+            self._touch(self._buckets, key, (tokens, now))
+            return (1 - tokens) / refill_per_second
+
+    def count(self, key: str, window: int) -> float:
+        now = time.time()
+        with self._lock:
+            state = self._windows.get(key)
+        return _weighted_count(state, window, now)
+
+    def add(self, key: str, window: int):
+        now = time.time()
+        with self._lock:
+            self._touch(self._windows, key, _advance_window(self._windows.get(key), window, now))
+
+    def reset(self, key: str):
+        with self._lock:
+            self._windows.pop(key, None)
+
+
+class SQLiteBackend:
+    """Same limits stored in a SQLite file so several workers share one view."""
+
+    def __init__(self, path: str, max_keys: int):
+        self.path = path
+        self.max_keys = max_keys
+        self._local = threading.local()
+        self._ops = 0
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS windows (key TEXT PRIMARY KEY, start REAL, current INTEGER, previous INTEGER)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _prune(self, conn):
+        # Keep the file bounded by dropping the least recently updated keys
+        self._ops += 1
+        if self._ops % 1000:
+            return
+        for table, column in (("buckets", "updated"), ("windows", "start")):
+            conn.execute(
+                f"DELETE FROM {table} WHERE key IN (SELECT key FROM {table} ORDER BY {column} DESC LIMIT -1 OFFSET ?)",
+                (self.max_keys,)
+            )
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            retry_after = 0 if tokens >= 1 else (1 - tokens) / refill_per_second
+            if tokens >= 1:
+                tokens -= 1
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            self._prune(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def count(self, key: str, window: int) -> float:
+        row = self._connect().execute("SELECT start, current, previous FROM windows WHERE key = ?", (key,)).fetchone()
+        return _weighted_count(row, window, time.time())
+
+    def add(self, key: str, window: int):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT start, current, previous FROM windows WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO windows (key, start, current, previous) VALUES (?, ?, ?, ?)",
+                (key, *_advance_window(row, window, time.time()))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reset(self, key: str):
+        self._connect().execute("DELETE FROM windows WHERE key = ?", (key,))
+
+
+def _advance_window(state, window: int, now: float):
+    # state is (window start, count in current window, count in previous window)
+    start = now - now % window
+    if state is None:
+        return start, 1, 0
+    old_start, current, previous = state
+    if old_start == start:
+        return start, current + 1, previous
+    if old_start == start - window:
+        return start, 1, current
+    return start, 1, 0
+
+
+def _weighted_count(state, window: int, now: float) -> float:
+    if state is None:
+        return 0
+    start = now - now % window
+    old_start, current, previous = state
+    if old_start == start:
+        return current + previous * (1 - (now - start) / window)
+    if old_start == start - window:
+        return current * (1 - (now - start) / window)
+    return 0
+
+
+def _create_backend(url: str):
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):], RATE_LIMIT_MAX_KEYS)
+    if url != "memory":
+        logger.warning(f"Unknown rate limit backend '{url}', using in-memory limits")
+    return MemoryBackend(RATE_LIMIT_MAX_KEYS)
+
+
+backend = _create_backend(LOGIN_RATE_LIMIT_BACKEND)
+
+
+def check_login_attempt(request: Request, email: str):
+    """Reject a login attempt before any DB lookup or bcrypt verify if it exceeds a limit."""
+    email = email.lower()
+    client_ip = request.client.host if request.client else "unknown"
+
+    retry_after = backend.take(f"ip:{client_ip}", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60)
+    if not retry_after:
+        retry_after = backend.take(f"email:{email}", LOGIN_EMAIL_BURST, LOGIN_EMAIL_PER_MINUTE / 60)
+    if not retry_after and backend.count(f"fail:{email}", LOGIN_FAILURE_WINDOW_SECONDS) >= LOGIN_MAX_FAILURES:
+        retry_after = LOGIN_FAILURE_WINDOW_SECONDS
+
+    if retry_after:
+        logger.warning(f"Login rate limit exceeded for {email} from {client_ip}")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+def record_login_failure(email: str):
+    backend.add(f"fail:{email.lower()}", LOGIN_FAILURE_WINDOW_SECONDS)
+
+
+def record_login_success(email: str):
+    backend.reset(f"fail:{email.lower()}")
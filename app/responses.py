@@ -0,0 +1,176 @@
+import zlib
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from .config import JSON_RESPONSE_CLASS, RESPONSE_COMPRESSION, COMPRESSION_MINIMUM_SIZE, COMPRESSION_LEVEL
+from .logger import logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Payloads that are already compressed (or must not be buffered) are sent as-is
+SKIP_COMPRESSION_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument.",
+    "application/vnd.apache.parquet",
+    "image/",
+    "audio/",
+    "video/",
+    "text/event-stream",
+)
+
+
+def json_response_class():
+    if JSON_RESPONSE_CLASS == "orjson":
+        try:
+            import orjson  # noqa: F401
+            return ORJSONResponse
+        except ImportError:
+            logger.warning("orjson is not installed, falling back to the standard JSON encoder")
+    return JSONResponse
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=min(level, 11))
+
+    def process(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+COMPRESSORS = {"gzip": _GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = _BrotliCompressor
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """Gzip/brotli response compression with a minimum-size threshold."""
+
+    def __init__(self, app, encodings: str = RESPONSE_COMPRESSION,
+                 minimum_size: int = COMPRESSION_MINIMUM_SIZE, level: int = COMPRESSION_LEVEL):
+        self.app = app
+        self.encodings = [e.strip() for e in encodings.split(",") if e.strip() in COMPRESSORS]
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = next((e for e in self.encodings if e in accepted), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size, self.level)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: str, minimum_size: int, level: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.send = None
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _should_skip(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(SKIP_COMPRESSION_TYPES)
+
+    def _mark_encoded(self, headers: MutableHeaders):
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+    async def send_wrapper(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+
+            if self._should_skip(headers) or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.passthrough = False
+            self.compressor = COMPRESSORS[self.encoding](self.level)
+            self._mark_encoded(headers)
+
+            if not more_body:
+                body = self.compressor.process(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            # Streaming response: length is unknown once compressed
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": self.compressor.process(body), "more_body": True})
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        chunk = self.compressor.process(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
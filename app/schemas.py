@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date,datetime
 
 class UserCreate(BaseModel):
@@ -12,6 +12,9 @@ class Login(BaseModel):
     email: EmailStr
     password: str
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class DepartmentCreate(BaseModel):
     department_name: str
     head_user_id: int
@@ -25,6 +28,7 @@ class CourseCreate(BaseModel):
     course_code: str
     credits: int
     department_id: int
+    term_id: Optional[int] = None
 
 
 class CourseOut(BaseModel):
@@ -33,10 +37,20 @@ class CourseOut(BaseModel):
     course_code: str
     created_at:datetime
     credits: int
+    term_id: Optional[int] = None
 
 class AssignCourse(BaseModel):
     course_id: int
     student_id: int
+    term_id: Optional[int] = None
+
+class TermCreate(BaseModel):
+    term_name: str = Field(..., max_length=50)
+    start_date: date
+    end_date: date
+
+class BulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
 
 class UserOut(BaseModel):
     user_id: int
@@ -0,0 +1,177 @@
+import re
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+from .logger import logger
+
+# SQLite: FTS5 tables keyed by the source row id, kept in sync by triggers
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(full_name, email, tokenize='unicode61', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5(course_title, course_code, tokenize='unicode61', prefix='2 3')",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, full_name, email) VALUES (new.user_id, new.full_name, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF full_name, email ON users BEGIN
+        DELETE FROM users_fts WHERE rowid = old.user_id;
+        INSERT INTO users_fts(rowid, full_name, email) VALUES (new.user_id, new.full_name, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        DELETE FROM users_fts WHERE rowid = old.user_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS courses_fts_ai AFTER INSERT ON courses BEGIN
+        INSERT INTO courses_fts(rowid, course_title, course_code) VALUES (new.course_id, new.course_title, new.course_code);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS courses_fts_au AFTER UPDATE OF course_title, course_code ON courses BEGIN
+        DELETE FROM courses_fts WHERE rowid = old.course_id;
+        INSERT INTO courses_fts(rowid, course_title, course_code) VALUES (new.course_id, new.course_title, new.course_code);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS courses_fts_ad AFTER DELETE ON courses BEGIN
+        DELETE FROM courses_fts WHERE rowid = old.course_id;
+    END""",
+]
+
+SQLITE_BACKFILL = [
+    "INSERT INTO users_fts(rowid, full_name, email) SELECT user_id, full_name, email FROM users",
+    "INSERT INTO courses_fts(rowid, course_title, course_code) SELECT course_id, course_title, course_code FROM courses",
+]
+
+# PostgreSQL: trigram GIN indexes on the columns themselves, maintained by the database
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_courses_course_title_trgm ON courses USING gin (course_title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_courses_course_code_trgm ON courses USING gin (course_code gin_trgm_ops)",
+]
+
+# Trigrams need three characters; a shorter ILIKE pattern cannot use the GIN indexes and scans the table
+POSTGRES_MIN_QUERY_LENGTH = 3
+
+# MySQL: InnoDB FULLTEXT indexes, maintained by the database
+MYSQL_FULLTEXT_INDEXES = {
+    "users": ("ft_users_search", "full_name, email"),
+    "courses": ("ft_courses_search", "course_title, course_code"),
+}
+
+STUDENT_QUERIES = {
+    "sqlite": """
+        SELECT u.user_id, u.full_name, u.email, -bm25(users_fts) AS score
+        FROM users_fts
+        JOIN users u ON u.user_id = users_fts.rowid
+        JOIN roles r ON r.role_id = u.role_id
+        WHERE users_fts MATCH :query AND r.role_name = 'Student'
+        ORDER BY score DESC
+        LIMIT :limit OFFSET :offset
+    """,
+    "postgresql": """
+        SELECT u.user_id, u.full_name, u.email,
+               GREATEST(similarity(u.full_name, :query), similarity(u.email, :query)) AS score
+        FROM users u
+        JOIN roles r ON r.role_id = u.role_id
+        WHERE (u.full_name ILIKE :pattern ESCAPE '\\' OR u.email ILIKE :pattern ESCAPE '\\') AND r.role_name = 'Student'
+        ORDER BY score DESC
+        LIMIT :limit OFFSET :offset
+    """,
+    "mysql": """
+        SELECT u.user_id, u.full_name, u.email,
+               MATCH(u.full_name, u.email) AGAINST (:query IN BOOLEAN MODE) AS score
+        FROM users u
+        JOIN roles r ON r.role_id = u.role_id
+        WHERE MATCH(u.full_name, u.email) AGAINST (:query IN BOOLEAN MODE) AND r.role_name = 'Student'
+        ORDER BY score DESC
+        LIMIT :limit OFFSET :offset
+    """,
+}
+
+COURSE_QUERIES = {
+    "sqlite": """
+        SELECT c.course_id, c.course_title, c.course_code, c.credits, -bm25(courses_fts) AS score
+        FROM courses_fts
+        JOIN courses c ON c.course_id = courses_fts.rowid
+        WHERE courses_fts MATCH :query
+        ORDER BY score DESC
+        LIMIT :limit OFFSET :offset
+    """,
+    "postgresql": """
+        SELECT c.course_id, c.course_title, c.course_code, c.credits,
+               GREATEST(similarity(c.course_title, :query), similarity(c.course_code, :query)) AS score
+        FROM courses c
+        WHERE c.course_title ILIKE :pattern ESCAPE '\\' OR c.course_code ILIKE :pattern ESCAPE '\\'
+        ORDER BY score DESC
+        LIMIT :limit OFFSET :offset
+    """,
+    "mysql": """
+        SELECT c.course_id, c.course_title, c.course_code, c.credits,
+               MATCH(c.course_title, c.course_code) AGAINST (:query IN BOOLEAN MODE) AS score
+        FROM courses c
+        WHERE MATCH(c.course_title, c.course_code) AGAINST (:query IN BOOLEAN MODE)
+        ORDER BY score DESC
+        LIMIT :limit OFFSET :offset
+    """,
+}
+
+
+def ensure_search_index(engine):
+    """Create the search index for the engine's backend; safe to run on every deploy."""
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            is_new = not inspect(conn).has_table("users_fts")
+            for statement in SQLITE_SEARCH_DDL:
+                conn.execute(text(statement))
+            if is_new:
+                for statement in SQLITE_BACKFILL:
+                    conn.execute(text(statement))
+        elif dialect == "postgresql":
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+        elif dialect == "mysql":
+            for table, (index_name, columns) in MYSQL_FULLTEXT_INDEXES.items():
+                existing = {index["name"] for index in inspect(conn).get_indexes(table)}
+                if index_name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index_name} ({columns})"))
+        else:
+            logger.warning(f"No search index support for '{dialect}', search will not be available")
+            return
+
+    logger.info(f"Search index ready ({dialect})")
+
+
+class QueryTooShort(ValueError):
+    """The query is too short to be served from the search index on this backend."""
+
+
+def _query_params(dialect: str, query: str):
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    if dialect == "sqlite":
+        return {"query": " ".join(f'"{term}"*' for term in terms)}
+    if dialect == "mysql":
+        return {"query": " ".join(f"+{term}*" for term in terms)}
+    if len(query.strip()) < POSTGRES_MIN_QUERY_LENGTH:
+        raise QueryTooShort(f"Search needs at least {POSTGRES_MIN_QUERY_LENGTH} characters.")
+    # Match the user's text literally: % and _ are wildcards in ILIKE
+    literal = re.sub(r"([\\%_])", r"\\\1", query.strip())
+    return {"query": query.strip(), "pattern": f"%{literal}%"}
+
+
+def _search(db: Session, queries: dict, query: str, limit: int, offset: int):
+    dialect = db.get_bind().dialect.name
+    if dialect not in queries:
+        raise ValueError(f"Search is not supported on '{dialect}'")
+
+    params = _query_params(dialect, query)
+    if params is None:
+        return []
+
+    rows = db.execute(text(queries[dialect]), {**params, "limit": limit, "offset": offset})
+    return [dict(row._mapping) for row in rows]
+
+
+def search_students(db: Session, query: str, limit: int = 20, offset: int = 0):
+    return _search(db, STUDENT_QUERIES, query, limit, offset)
+
+
+def search_courses(db: Session, query: str, limit: int = 20, offset: int = 0):
+    return _search(db, COURSE_QUERIES, query, limit, offset)
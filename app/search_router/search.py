@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..security import get_current_user
+from ..search import search_students, search_courses, QueryTooShort
+from ..logger import logger
+
+router = APIRouter()
+
+@router.get("/students")
+def search_students_endpoint(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] not in ["Admin", "Teacher"]:
+        raise HTTPException(status_code=403, detail="Only admins and teachers can search students.")
+
+    try:
+        results = search_students(db, q, limit, offset)
+    except QueryTooShort as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        logger.error(f"Student search failed: {e}")
+        raise HTTPException(status_code=501, detail="Search is not available on this database.")
+
+    return {"results": results, "limit": limit, "offset": offset}
+
+
+@router.get("/courses")
+def search_courses_endpoint(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        results = search_courses(db, q, limit, offset)
+    except QueryTooShort as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        logger.error(f"Course search failed: {e}")
+        raise HTTPException(status_code=501, detail="Search is not available on this database.")
+
+    return {"results": results, "limit": limit, "offset": offset}
@@ -1,14 +1,26 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
 from passlib.context import CryptContext
 from jose import JWTError,jwt
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from .config import SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES
+from sqlalchemy.orm import Session, joinedload
+from .config import (
+    SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS,
+    TOKEN_CACHE_SIZE, REVOCATION_SYNC_SECONDS, CHANGE_FEED_TICKET_SECONDS,
+)
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import HTTPException,Depends
-from .database import get_db
-from .model import User
+from fastapi import HTTPException,Depends,Request
+from .database import get_db, SessionLocal
+from .model import User, AuthSession
+from .rate_limit import check_login_attempt, record_login_failure, record_login_success
+from .logger import logger
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,31 +30,190 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+@lru_cache(maxsize=None)
+def _dummy_password_hash() -> str:
+    # Hashed on first use rather than at import, to keep bcrypt out of worker startup
+    return hash_password(uuid.uuid4().hex)
+
+def authenticate_user(request: Request, db: Session, email: str, password: str, role: str = None):
+    # Single indexed lookup by email with the role loaded in the same query, then one verify
+    check_login_attempt(request, email)
+
+    user = db.query(User).options(joinedload(User.role)).filter(User.email == email).first()
+
+    # Always pay for one bcrypt verify, so response time does not reveal whether the email exists
+    password_ok = verify_password(password, user.password_hash if user else _dummy_password_hash())
+
+    if (
+        not user
+        or user.role is None
+        or (role and user.role.role_name != role)
+        or not password_ok
+    ):
+        logger.warning(f"Login failed for {email}")
+        record_login_failure(email)
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    record_login_success(email)
+    return user
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": "access"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm="HS256")
 
 
-def verify_access_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY,  algorithms=["HS256"])
+def create_refresh_token(data: dict, expires_delta: timedelta = None):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    to_encode.update({"exp": expire, "type": "refresh"})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm="HS256")
+
+
+def create_stream_ticket(claims: dict):
+    # Short-lived token for the SSE stream's query string; it keeps the session's jti so logout revokes it
+    data = {key: claims[key] for key in ("user_id", "role", "jti") if key in claims}
+    data.update({"exp": datetime.utcnow() + timedelta(seconds=CHANGE_FEED_TICKET_SECONDS), "type": "stream"})
+    return jwt.encode(data, SECRET_KEY, algorithm="HS256")
+
+
+def issue_tokens(db: Session, user_id: int, role: str):
+    # Expired sessions are purged here, on login, so request authentication never writes
+    db.query(AuthSession).filter(AuthSession.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+
+    # One session row per login; access and refresh tokens share its id as "jti"
+    session = AuthSession(
+        session_id=uuid.uuid4().hex,
+        user_id=user_id,
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(session)
+    db.commit()
+
+    data = {"user_id": user_id, "role": role, "jti": session.session_id}
+    return {
+        "access_token": create_access_token(data),
+        "refresh_token": create_refresh_token(data),
+        "token_type": "bearer"
+    }
+
+
+class TokenCache:
+    """Small LRU of decoded token payloads, so hot tokens skip signature checks."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            payload = self._items.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._items[token]
+                return None
+            self._items.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: dict):
+        with self._lock:
+            self._items[token] = payload
+            self._items.move_to_end(token)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+class RevocationStore:
+    """In-memory set of revoked session ids, persisted in auth_sessions.
+
+    Other workers pick up revocations on the next periodic sync.
+    """
+
+    def __init__(self, sync_seconds: int):
+        self.sync_seconds = sync_seconds
+        self._revoked = set()
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def _is_stale(self) -> bool:
+        return self._synced_at is None or time.monotonic() - self._synced_at > self.sync_seconds
+
+    def is_revoked(self, session_id: str) -> bool:
+        if self._is_stale():
+            self.sync()
+        return session_id in self._revoked
+
+    def sync(self):
+        with self._lock:
+            # Requests that queued on the lock find the set already refreshed
+            if not self._is_stale():
+                return
+            db = SessionLocal()
+            try:
+                rows = db.query(AuthSession.session_id).filter(
+                    AuthSession.revoked_at.isnot(None),
+                    AuthSession.expires_at >= datetime.utcnow()
+                ).all()
+            finally:
+                db.close()
+            self._revoked = {row.session_id for row in rows}
+            self._synced_at = time.monotonic()
+
+    def revoke(self, db: Session, session_ids: list):
+        if not session_ids:
+            return
+        db.query(AuthSession).filter(
+            AuthSession.session_id.in_(session_ids),
+            AuthSession.revoked_at.is_(None)
+        ).update({AuthSession.revoked_at: datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+        with self._lock:
+            self._revoked.update(session_ids)
+
+    def revoke_users(self, db: Session, user_ids: list):
+        rows = db.query(AuthSession.session_id).filter(
+            AuthSession.user_id.in_(user_ids),
+            AuthSession.revoked_at.is_(None)
+        ).all()
+        self.revoke(db, [row.session_id for row in rows])
+        logger.info(f"Revoked {len(rows)} session(s) for user(s) {user_ids}")
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+revocation_store = RevocationStore(REVOCATION_SYNC_SECONDS)
+
+
+def decode_token(token: str, token_type: str = "access"):
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY,  algorithms=["HS256"])
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid or expired token.")
 
         # Ensure required fields exist in the token payload
         if "user_id" not in payload or "role" not in payload:
             raise HTTPException(status_code=400, detail="Invalid token: Missing user_id or role.")
 
-        return payload
+        token_cache.put(token, payload)
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token.")
+    if payload.get("type", "access") != token_type:
+        raise HTTPException(status_code=401, detail="Invalid token type.")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    payload = verify_access_token(token)
+    if "jti" in payload and revocation_store.is_revoked(payload["jti"]):
+        raise HTTPException(status_code=401, detail="Token has been revoked.")
+
+    return payload
+
+
+def verify_access_token(token: str):
+    return decode_token(token, "access")
+
+
+def _load_current_user(db: Session, payload: dict):
     user = db.query(User).filter(User.user_id == payload["user_id"]).first()
 
     if not user:
@@ -52,4 +223,26 @@ def get_current_user(
         "user_id": user.user_id,
         "username": user.full_name,
         "role": user.role.role_name
-    }
\ No newline at end of file
+    }
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    return _load_current_user(db, verify_access_token(token))
+
+
+def get_stream_user(
+    ticket: Optional[str] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """get_current_user for the SSE stream: also accepts ?ticket=, since EventSource cannot send headers."""
+    if token:
+        payload = verify_access_token(token)
+    elif ticket:
+        payload = decode_token(ticket, "stream")
+    else:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return _load_current_user(db, payload)
@@ -1,37 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from ..database import get_db
-from ..model import User, Role
 from ..schemas import Login
-from ..security import verify_password, create_access_token
+from ..security import authenticate_user, issue_tokens
 from ..logger import logger
 
 router = APIRouter()
 
-@router.post("/login-student")
+# Deprecated: use POST /login
+@router.post("/login-student", deprecated=True)
 def login_student(
     login_data: Login,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).join(Role).filter(
-        User.email == login_data.email,
-        Role.role_name == "Student"
-    ).first()
-
-    if not user:
-        logger.warning(f"Student login failed: No user found with email {login_data.email}")
-        raise HTTPException(status_code=404, detail="Student not found")
-
-    if not verify_password(login_data.password, user.password_hash):
-        logger.warning(f"Student login failed: Incorrect password for {login_data.email}")
-        raise HTTPException(status_code=401, detail="Invalid password")
-
-    access_token = create_access_token(
-        data={"user_id": user.user_id, "role": "Student"}
-    )
+    user = authenticate_user(request, db, login_data.email, login_data.password, role="Student")
+    tokens = issue_tokens(db, user.user_id, "Student")
 
     logger.info(f"Student login successful: {user.email}")
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return tokens
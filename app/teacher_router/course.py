@@ -1,14 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import zipfile
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from ..config import COURSE_IMPORT_MAX_ROWS
 from ..database import get_db
-from ..model import Course, User, Department,Role
-from ..schemas import CourseCreate, CourseOut,AssignCourse
+from ..model import Course, User, Department,Role,Term,student_courses
+from ..change_tracking import record_enrollment_tombstones
+from ..schemas import CourseCreate, CourseOut,AssignCourse,BulkDelete
 from ..security import get_current_user
+from ..events import change_feed
 
+from ..audit import audit_log
 from ..logger import logger
 
 router = APIRouter()
 
+
+def _check_open_term(db: Session, term_id: int):
+    if term_id is None:
+        return
+    term = db.query(Term).filter(Term.term_id == term_id).first()
+    if not term:
+        raise HTTPException(status_code=404, detail="Term not found.")
+    if term.is_closed:
+        raise HTTPException(status_code=400, detail="Term is closed.")
+
+
 # Create a new course (only for teachers)
 @router.post("/courses", response_model=CourseOut, status_code=201)
 def create_course(
@@ -24,17 +44,22 @@ def create_course(
     if not department:
         raise HTTPException(status_code=404, detail="Department not found.")
 
+    _check_open_term(db, course.term_id)
+
     new_course = Course(
         course_title=course.course_title,
         course_code=course.course_code,
         credits=course.credits,
         instructor_id=current_user["user_id"],
-        department_id=course.department_id
+        department_id=course.department_id,
+        term_id=course.term_id
     )
     db.add(new_course)
     db.commit()
     db.refresh(new_course)
 
+    change_feed.publish("course_created", new_course.course_id, instructor_id=new_course.instructor_id,
+                        course_code=new_course.course_code)
     logger.info(f"Course created by teacher {current_user['user_id']}: {course.course_code}")
     return new_course
 
@@ -81,9 +106,17 @@ def update_course(
     course.credits = updated_course.credits
     course.department_id = updated_course.department_id
 
+    # Clients that predate terms omit term_id; only an explicit value moves the course
+    if "term_id" in updated_course.model_fields_set and updated_course.term_id != course.term_id:
+        _check_open_term(db, course.term_id)
+        _check_open_term(db, updated_course.term_id)
+        course.term_id = updated_course.term_id
+
     db.commit()
     db.refresh(course)
 
+    change_feed.publish("course_updated", course.course_id, instructor_id=course.instructor_id,
+                        course_code=course.course_code)
     logger.info(f"Course updated by teacher {current_user['user_id']}: {course.course_code}")
     return course
 
@@ -109,10 +142,16 @@ def delete_course(
         logger.warning(f"Course not found or not authorized for user {current_user['user_id']}")
         raise HTTPException(status_code=404, detail="Course not found or not authorized.")
 
-    db.delete(course)
+    # The row is deleted with a bulk DELETE, so read what we publish before the instance goes stale
+    course_code = course.course_code
+
+    record_enrollment_tombstones(db, student_courses.c.course_id == course_id)
+    db.query(Course).filter(Course.course_id == course_id).delete(synchronize_session=False)
     db.commit()
 
-    logger.info(f"Course deleted by teacher {current_user['user_id']}: {course.course_code}")
+    change_feed.publish("course_deleted", course_id, instructor_id=current_user["user_id"],
+                        course_code=course_code)
+    logger.info(f"Course deleted by teacher {current_user['user_id']}: {course_code}")
     return {"message": "Course deleted successfully"}
 
 @router.post("/assign-course")
@@ -133,11 +172,207 @@ def assign_course_to_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found.")
 
-    if student in course.students:
+    already_assigned = db.query(student_courses.c.student_id).filter(
+        student_courses.c.student_id == student.user_id,
+        student_courses.c.course_id == course.course_id
+    ).first()
+    if already_assigned:
         raise HTTPException(status_code=400, detail="Student is already assigned to this course.")
 
-    course.students.append(student)
+    if payload.term_id is not None and payload.term_id != course.term_id:
+        raise HTTPException(status_code=400, detail="term_id does not match the course's term.")
+    _check_open_term(db, course.term_id)
+
+    db.execute(insert(student_courses).values(
+        student_id=student.user_id,
+        course_id=course.course_id,
+        term_id=course.term_id
+    ))
     db.commit()
 
+    change_feed.publish("enrollment_created", course.course_id, instructor_id=course.instructor_id,
+                        student_id=student.user_id)
+
+    audit_log.record(current_user["user_id"], "course.assign_student", "course", course.course_id,
+                     f"student_id={student.user_id}")
     logger.info(f"Course {course.course_code} assigned to student {student.email} by teacher {current_user['user_id']}")
     return {"message": f"Course '{course.course_title}' assigned to student '{student.full_name}'."}
+
+# Delete many of the teacher's courses in one statement; enrollments go by ON DELETE CASCADE
+@router.post("/courses/bulk-delete", status_code=200)
+def bulk_delete_courses(
+    payload: BulkDelete,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "Teacher":
+        logger.warning(f"Unauthorized bulk course delete attempt by user {current_user['user_id']}")
+        raise HTTPException(status_code=403, detail="Only teachers can delete courses.")
+
+    owned_courses = db.query(Course).filter(
+        Course.course_id.in_(payload.ids),
+        Course.instructor_id == current_user["user_id"]
+    )
+    course_ids = [row.course_id for row in owned_courses.with_entities(Course.course_id)]
+    record_enrollment_tombstones(db, student_courses.c.course_id.in_(course_ids))
+    deleted = owned_courses.delete(synchronize_session=False)
+    db.commit()
+
+    for course_id in course_ids:
+        change_feed.publish("course_deleted", course_id, instructor_id=current_user["user_id"])
+
+    logger.info(f"{deleted} course(s) bulk deleted by teacher {current_user['user_id']}")
+    return {"message": f"{deleted} course(s) deleted successfully", "deleted": deleted}
+
+
+IMPORT_COLUMNS = ("course_title", "course_code", "credits", "department_id")
+
+
+def _read_catalog_rows(upload: UploadFile):
+    """Yield the rows of an uploaded XLSX/CSV catalog as tuples, header row first."""
+    filename = (upload.filename or "").lower()
+    if filename.endswith(".xlsx"):
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+
+        try:
+            workbook = load_workbook(upload.file, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError):
+            # KeyError: a zip archive without the workbook parts, e.g. a renamed .docx
+            raise HTTPException(status_code=400, detail="The uploaded file is not a valid .xlsx workbook.")
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif filename.endswith(".csv"):
+        try:
+            yield from csv.reader(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="The uploaded CSV file must be UTF-8 encoded.")
+        except csv.Error as e:
+            raise HTTPException(status_code=400, detail=f"The uploaded CSV file could not be read: {e}")
+    else:
+        raise HTTPException(status_code=400, detail="Upload an .xlsx or .csv file.")
+
+
+def _parse_catalog(upload: UploadFile):
+    rows = _read_catalog_rows(upload)
+    header = next(rows, None)
+    if header is None:
+        raise HTTPException(status_code=400, detail="The uploaded file is empty.")
+
+    header = [str(name or "").strip().lower() for name in header]
+    missing = [name for name in IMPORT_COLUMNS if name not in header]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing column(s): {', '.join(missing)}")
+    positions = [header.index(name) for name in IMPORT_COLUMNS]
+
+    parsed = []
+    for row_number, row in enumerate(rows, start=2):
+        if not any(cell not in (None, "") for cell in row):
+            continue
+        if len(parsed) >= COURSE_IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=400, detail=f"At most {COURSE_IMPORT_MAX_ROWS} courses can be imported at once.")
+        values = [row[i] if i < len(row) else None for i in positions]
+        # Spreadsheet cells hold whole numbers as floats (101.0); keep them as integers
+        values = [int(v) if isinstance(v, float) and v.is_integer() else v for v in values]
+        title, code, credits, department_id = [str(v).strip() if v is not None else "" for v in values]
+        parsed.append((row_number, title, code, credits, department_id))
+    return parsed
+
+
+def _whole_number(value: str) -> int:
+    # Accepts "4" and "4.0" but not "3.5", which int(float(...)) would silently truncate
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{value} is not a whole number")
+    return int(number)
+
+
+# Import or update many courses from a spreadsheet in one transaction
+@router.post("/courses/import")
+def import_courses(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "Teacher":
+        logger.warning(f"Unauthorized course import attempt by user {current_user['user_id']}")
+        raise HTTPException(status_code=403, detail="Only teachers can import courses.")
+
+    rows = _parse_catalog(file)
+
+    report = []
+    valid = []
+    seen_codes = set()
+    for row_number, title, code, credits, department_id in rows:
+        error = None
+        if not title or not code:
+            error = "course_title and course_code are required."
+        elif len(title) > 100 or len(code) > 20:
+            error = "course_title or course_code is too long."
+        elif code in seen_codes:
+            error = "Duplicate course_code in file."
+        else:
+            try:
+                credits = _whole_number(credits)
+                department_id = _whole_number(department_id)
+            except ValueError:
+                error = "credits and department_id must be whole numbers."
+        if error:
+            report.append({"row": row_number, "course_code": code, "status": "error", "detail": error})
+            continue
+        seen_codes.add(code)
+        valid.append((row_number, title, code, credits, department_id))
+
+    # One query each for the referenced departments and already existing course codes
+    department_ids = {row[4] for row in valid}
+    known_departments = {
+        row.department_id for row in
+        db.query(Department.department_id).filter(Department.department_id.in_(department_ids))
+    } if department_ids else set()
+    existing_courses = {
+        course.course_code: course for course in
+        db.query(Course).filter(Course.course_code.in_(seen_codes))
+    } if seen_codes else {}
+
+    changed = []
+    for row_number, title, code, credits, department_id in valid:
+        result = {"row": row_number, "course_code": code}
+        course = existing_courses.get(code)
+        if department_id not in known_departments:
+            result.update(status="error", detail="Department not found.")
+        elif course is not None and course.instructor_id != current_user["user_id"]:
+            result.update(status="error", detail="Course code belongs to another instructor.")
+        else:
+            if course is None:
+                course = Course(course_code=code, instructor_id=current_user["user_id"])
+                db.add(course)
+                result["status"] = "created"
+            else:
+                result["status"] = "updated"
+            course.course_title = title
+            course.credits = credits
+            course.department_id = department_id
+            changed.append((course, result))
+        report.append(result)
+
+    try:
+        # Flush to get the new ids, and read them before commit expires every instance
+        db.flush()
+        for course, result in changed:
+            result["course_id"] = course.course_id
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Course import by teacher {current_user['user_id']} failed: {e}")
+        raise HTTPException(status_code=409, detail="Course import conflicted with a concurrent change, retry the import.")
+
+    for _, result in changed:
+        change_feed.publish(f"course_{result['status']}", result["course_id"], instructor_id=current_user["user_id"],
+                            course_code=result["course_code"])
+
+    report.sort(key=lambda result: result["row"])
+    summary = {outcome: sum(1 for result in report if result["status"] == outcome) for outcome in ("created", "updated", "error")}
+    logger.info(f"Course import by teacher {current_user['user_id']}: {summary}")
+    return {**summary, "rows": report}
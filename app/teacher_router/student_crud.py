@@ -1,14 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException,status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from ..database import get_db
-from ..model import User, Role
+from ..model import User, Role, Course, student_courses
+from ..change_tracking import record_enrollment_tombstones
 from typing import List
-from ..schemas import UserCreate,UserOut
-from ..security import get_current_user, hash_password
+from ..schemas import UserCreate,UserOut,BulkDelete
+from ..security import get_current_user, hash_password, revocation_store
+from ..events import change_feed
+from ..audit import audit_log
 from ..logger import logger
 
 router = APIRouter()
 
+
+def _enrollments_of(db: Session, student_ids: list):
+    """The students' enrollments with each course's instructor, read before they cascade away."""
+    return db.query(student_courses.c.student_id, student_courses.c.course_id, Course.instructor_id).join(
+        Course, Course.course_id == student_courses.c.course_id
+    ).filter(student_courses.c.student_id.in_(student_ids)).all()
+
+
+def _publish_enrollments_deleted(enrollments):
+    for enrollment in enrollments:
+        change_feed.publish("enrollment_deleted", enrollment.course_id, instructor_id=enrollment.instructor_id,
+                            student_id=enrollment.student_id)
+
 @router.get("/all-students", response_model=List[UserOut])
 def get_all_students(
     db: Session = Depends(get_db),
@@ -96,8 +113,46 @@ def delete_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found.")
 
-    db.delete(student)
+    # The row is deleted with a bulk DELETE, so read what we log before the instance goes stale
+    student_email = student.email
+
+    revocation_store.revoke_users(db, [student_id])
+    enrollments = _enrollments_of(db, [student_id])
+    record_enrollment_tombstones(db, student_courses.c.student_id == student_id)
+    db.query(User).filter(User.user_id == student_id).delete(synchronize_session=False)
     db.commit()
 
-    logger.info(f"Student deleted: {student.email}")
+    _publish_enrollments_deleted(enrollments)
+
+    audit_log.record(current_user["user_id"], "student.delete", "user", student_id, student_email)
+    logger.info(f"Student deleted: {student_email}")
     return {"message": "Student deleted successfully"}
+
+# Delete many students with a constant number of statements; enrollments go by ON DELETE CASCADE
+@router.post("/students/bulk-delete")
+def bulk_delete_students(
+    payload: BulkDelete,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    if current_user["role"] not in ["Admin", "Teacher"]:
+        raise HTTPException(status_code=403, detail="Only admins can delete students.")
+
+    student_role_ids = select(Role.role_id).where(Role.role_name == "Student")
+    student_filter = (User.user_id.in_(payload.ids), User.role_id.in_(student_role_ids))
+
+    student_ids = [row.user_id for row in db.query(User.user_id).filter(*student_filter)]
+    enrollments = []
+    if student_ids:
+        revocation_store.revoke_users(db, student_ids)
+        enrollments = _enrollments_of(db, student_ids)
+        record_enrollment_tombstones(db, student_courses.c.student_id.in_(student_ids))
+    deleted = db.query(User).filter(*student_filter).delete(synchronize_session=False)
+    db.commit()
+
+    _publish_enrollments_deleted(enrollments)
+
+    for student_id in student_ids:
+        audit_log.record(current_user["user_id"], "student.delete", "user", student_id, "bulk delete")
+    logger.info(f"{deleted} student(s) bulk deleted by user {current_user['user_id']}")
+    return {"message": f"{deleted} student(s) deleted successfully", "deleted": deleted}
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Path,status
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..database import get_db
-from ..model import User, Role
+from ..model import User, Role, Course
 from ..schemas import UserCreate,Login
-from ..security import hash_password,verify_password,create_access_token,get_current_user
+from ..security import hash_password,authenticate_user,issue_tokens,get_current_user,revocation_store
+from ..events import change_feed
+from ..audit import audit_log
 from ..logger import logger
 
 
@@ -43,32 +46,19 @@ def register_teacher(
     db.commit()
     db.refresh(new_teacher)
 
+    audit_log.record(current_user["user_id"], "teacher.register", "user", new_teacher.user_id, new_teacher.email)
     logger.info(f"Teacher registered successfully: {new_teacher.email}")
     return {"message": "Teacher registered successfully"}
 
 
-@router.post("/login-teacher")
-def login_teacher(login_data: Login, db: Session = Depends(get_db)):
-    user = db.query(User).join(Role).filter(
-        User.email == login_data.email,
-        Role.role_name == "Teacher"
-    ).first()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="Teacher not found")
-
-    if not verify_password(login_data.password, user.password_hash):
-        raise HTTPException(status_code=401, detail="Invalid password")
-
-    access_token = create_access_token(
-        data={"user_id": user.user_id, "role": "Teacher"}
-    )
+# Deprecated: use POST /login
+@router.post("/login-teacher", deprecated=True)
+def login_teacher(login_data: Login, request: Request, db: Session = Depends(get_db)):
+    user = authenticate_user(request, db, login_data.email, login_data.password, role="Teacher")
+    tokens = issue_tokens(db, user.user_id, "Teacher")
 
     logger.info(f"Teacher login successful: {user.email}")
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return tokens
 
 @router.put("/update-teacher/{teacher_id}")
 def update_teacher(
@@ -92,6 +82,7 @@ def update_teacher(
     db.commit()
     db.refresh(teacher)
 
+    audit_log.record(current_user["user_id"], "teacher.update", "user", teacher.user_id, teacher.email)
     logger.info(f"Teacher updated: {teacher.email}")
     return {"message": "Teacher updated successfully"}
 
@@ -109,8 +100,21 @@ def delete_teacher(
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found.")
 
-    db.delete(teacher)
+    # The row is deleted with a bulk DELETE, so read what we log before the instance goes stale
+    teacher_email = teacher.email
+
+    revocation_store.revoke_users(db, [teacher_id])
+    # instructor_id is cleared by ON DELETE SET NULL; mark the courses changed for delta exports
+    courses = db.query(Course.course_id, Course.course_code).filter(Course.instructor_id == teacher_id).all()
+    db.query(Course).filter(Course.instructor_id == teacher_id).update(
+        {Course.updated_at: func.now()}, synchronize_session=False
+    )
+    db.query(User).filter(User.user_id == teacher_id).delete(synchronize_session=False)
     db.commit()
 
-    logger.info(f"Teacher deleted: {teacher.email}")
+    for course in courses:
+        change_feed.publish("course_updated", course.course_id, course_code=course.course_code)
+
+    audit_log.record(current_user["user_id"], "teacher.delete", "user", teacher_id, teacher_email)
+    logger.info(f"Teacher deleted: {teacher_email}")
     return {"message": "Teacher deleted successfully"}
\ No newline at end of file
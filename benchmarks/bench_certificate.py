@@ -0,0 +1,65 @@
+"""Compare certificate renderer backends: renders per second and memory per render.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_certificate.py --renders 50
+
+Each backend is constructed once (font/template/background setup is not timed),
+warmed up, then timed over --renders renders. Memory is the tracemalloc peak of a
+single render.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_certificate.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.excel_router.certificate_renderers import RENDERERS  # noqa: E402
+
+FIELDS = {
+    "student_name": "Ram Krishna Prabhu",
+    "course_title": "Database Management Systems",
+    "instructor_name": "Roopa Shenoy",
+    "date": "May 07, 2025",
+}
+
+
+def bench(renderer_class, renders):
+    start = time.perf_counter()
+    renderer = renderer_class()
+    setup = time.perf_counter() - start
+
+    size = len(renderer.render(**FIELDS))  # warm-up
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        renderer.render(**FIELDS)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    renderer.render(**FIELDS)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return setup, renders / elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=50)
+    parser.add_argument("--backend", choices=sorted(RENDERERS), action="append")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'setup ms':>10}{'renders/s':>12}{'peak KiB':>12}{'pdf KiB':>10}")
+    for name in args.backend or sorted(RENDERERS):
+        setup, rate, peak, size = bench(RENDERERS[name], args.renders)
+        print(f"{name:<10}{setup * 1000:>10.1f}{rate:>12.1f}{peak / 1024:>12.1f}{size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
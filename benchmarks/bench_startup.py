@@ -0,0 +1,56 @@
+"""Measure worker cold-start cost: time to import app.main in a fresh interpreter.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_startup.py --runs 10
+
+Also reports which heavy report/PDF dependencies were loaded at import time;
+with lazy loading none of them should be.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("openpyxl", "xhtml2pdf", "reportlab", "jinja2", "pyarrow")
+
+PROBE = (
+    "import sys, app.main; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def run_once(env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///./bench_startup.db")
+    env.setdefault("SECRET_KEY", "bench")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+
+    run_once(env)  # warm the OS file cache and __pycache__
+    timings = []
+    loaded = ""
+    for _ in range(args.runs):
+        elapsed, loaded = run_once(env)
+        timings.append(elapsed)
+
+    print(f"import app.main over {args.runs} runs")
+    print(f"  median: {statistics.median(timings) * 1000:.1f} ms")
+    print(f"  min:    {min(timings) * 1000:.1f} ms")
+    print(f"  max:    {max(timings) * 1000:.1f} ms")
+    print(f"  heavy modules loaded at import: {loaded or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+
+
+@pytest.fixture
+def db():
+    from app.database import Base, SessionLocal, engine
+    from app import model  # noqa: F401
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def login_as():
+    from app.main import app
+    from app.security import get_current_user
+
+    def _login_as(user_id: int, role: str):
+        app.dependency_overrides[get_current_user] = lambda: {
+            "user_id": user_id, "username": f"{role} {user_id}", "role": role
+        }
+
+    return _login_as
@@ -0,0 +1,70 @@
+from sqlalchemy import select
+
+from app.model import Course, Department, Role, User, student_courses
+
+
+def _seed(db):
+    roles = {name: Role(role_name=name) for name in ("Admin", "Teacher", "Student")}
+    db.add_all(roles.values())
+    db.flush()
+
+    users = {
+        "admin": User(full_name="Admin", email="admin@example.com", password_hash="x", role_id=roles["Admin"].role_id),
+        "teacher": User(full_name="Teacher", email="teacher@example.com", password_hash="x", role_id=roles["Teacher"].role_id),
+        "student": User(full_name="Student", email="student@example.com", password_hash="x", role_id=roles["Student"].role_id),
+    }
+    db.add_all(users.values())
+    db.flush()
+
+    department = Department(department_name="Science", head_user_id=users["admin"].user_id)
+    db.add(department)
+    db.flush()
+
+    course = Course(course_title="Physics", course_code="PHY101", credits=4,
+                    instructor_id=users["teacher"].user_id, department_id=department.department_id)
+    db.add(course)
+    db.flush()
+    db.execute(student_courses.insert().values(student_id=users["student"].user_id, course_id=course.course_id))
+    db.commit()
+
+    return {key: user.user_id for key, user in users.items()}, department.department_id, course.course_id
+
+
+def test_delete_department_returns_200(client, db, login_as):
+    users, department_id, course_id = _seed(db)
+    login_as(users["admin"], "Admin")
+
+    response = client.delete(f"/admin/departments/{department_id}")
+
+    assert response.status_code == 200
+    assert db.execute(select(Course.course_id).where(Course.course_id == course_id)).first() is None
+
+
+def test_delete_course_returns_200(client, db, login_as):
+    users, _, course_id = _seed(db)
+    login_as(users["teacher"], "Teacher")
+
+    response = client.delete(f"/teacher/courses/{course_id}")
+
+    assert response.status_code == 200
+    assert db.execute(select(student_courses).where(student_courses.c.course_id == course_id)).first() is None
+
+
+def test_delete_student_returns_200(client, db, login_as):
+    users, _, _ = _seed(db)
+    login_as(users["admin"], "Admin")
+
+    response = client.delete(f"/teacher/delete-student/{users['student']}")
+
+    assert response.status_code == 200
+    assert db.execute(select(User.user_id).where(User.user_id == users["student"])).first() is None
+
+
+def test_delete_teacher_returns_200(client, db, login_as):
+    users, _, course_id = _seed(db)
+    login_as(users["admin"], "Admin")
+
+    response = client.delete(f"/teacher/delete-teacher/{users['teacher']}")
+
+    assert response.status_code == 200
+    assert db.execute(select(Course.instructor_id).where(Course.course_id == course_id)).scalar() is None
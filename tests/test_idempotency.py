@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from app import idempotency
+from app.idempotency import IdempotencyMiddleware, MemoryStore, SQLiteStore
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class CountingApp:
+    """Endpoint that answers with its call count; `gate` lets a test hold a request open."""
+
+    def __init__(self, status=201, error=None):
+        self.status = status
+        self.error = error
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await receive()
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        await send({"type": "http.response.start", "status": self.status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"call": %d}' % self.calls})
+
+
+async def _request(middleware, body=b"{}", key="key-1", path="/teacher/courses"):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode()), (b"authorization", b"Bearer token")],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    headers = {k.decode(): v.decode() for k, v in messages[0].get("headers", [])}
+    return messages[0]["status"], headers, b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def request(middleware, **kwargs):
+    return asyncio.run(_request(middleware, **kwargs))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore(ttl=3600, max_keys=100, pending_lease=60)
+    return SQLiteStore(str(tmp_path / "idempotency.db"), ttl=3600, max_keys=100, pending_lease=60)
+
+
+def test_repeated_key_replays_stored_response(store):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app, store=store)
+
+    first = request(middleware)
+    second = request(middleware)
+
+    assert app.calls == 1
+    assert second[0] == first[0] == 201
+    assert second[2] == first[2]
+    assert second[1]["idempotent-replayed"] == "true"
+
+
+def test_key_reused_with_different_body_is_rejected(store):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app, store=store)
+
+    request(middleware, body=b'{"credits": 3}')
+    status, _, _ = request(middleware, body=b'{"credits": 4}')
+
+    assert status == 422
+    assert app.calls == 1
+
+
+def test_key_in_progress_conflicts(store):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app, store=store)
+
+    async def scenario():
+        app.gate = asyncio.Event()
+        first = asyncio.create_task(_request(middleware))
+        while app.calls == 0:
+            await asyncio.sleep(0)
+        second = await _request(middleware)
+        app.gate.set()
+        return await first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first[0] == 201
+    assert second[0] == 409
+    assert app.calls == 1
+
+
+@pytest.mark.parametrize("failure", [{"status": 503}, {"error": RuntimeError("boom")}])
+def test_failed_request_releases_key(store, failure):
+    app = CountingApp(**failure)
+    middleware = IdempotencyMiddleware(app, store=store)
+
+    for _ in range(2):
+        try:
+            request(middleware)
+        except RuntimeError:
+            pass
+
+    assert app.calls == 2
+
+
+def test_pending_reservation_expires_after_lease(store, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(idempotency, "time", clock)
+
+    assert store.reserve("key", "fingerprint") is None
+    assert store.reserve("key", "fingerprint")[1] is None  # still pending
+
+    clock.now += 61
+    assert store.reserve("key", "fingerprint") is None
+
+
+def test_completed_response_outlives_pending_lease(store, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(idempotency, "time", clock)
+
+    store.reserve("key", "fingerprint")
+    store.complete("key", "fingerprint", 201, [["content-type", "application/json"]], b"{}")
+
+    clock.now += 61
+    assert store.reserve("key", "fingerprint")[1] == 201
+
+    clock.now += 3600
+    assert store.reserve("key", "fingerprint") is None
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app import rate_limit
+from app.rate_limit import MemoryBackend, SQLiteBackend, _advance_window, _weighted_count
+
+
+class FakeClock:
+    def __init__(self, now=1_000_020.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_keys=100)
+    return SQLiteBackend(str(tmp_path / "rate_limit.db"), max_keys=100)
+
+
+def test_bucket_allows_burst_then_refills(backend, clock):
+    assert backend.take("ip:1", 2, 1.0) == 0
+    assert backend.take("ip:1", 2, 1.0) == 0
+    assert backend.take("ip:1", 2, 1.0) == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert backend.take("ip:1", 2, 1.0) == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert backend.take("ip:1", 2, 1.0) == 0
+
+
+def test_bucket_refill_is_capped_at_capacity(backend, clock):
+    backend.take("ip:1", 2, 1.0)
+    clock.now += 3600
+
+    assert backend.take("ip:1", 2, 1.0) == 0
+    assert backend.take("ip:1", 2, 1.0) == 0
+    assert backend.take("ip:1", 2, 1.0) > 0
+
+
+def test_window_counts_roll_over(backend, clock):
+    clock.now = 120.0
+    for _ in range(3):
+        backend.add("fail:a", 60)
+    assert backend.count("fail:a", 60) == 3
+
+    # Halfway through the next window the previous window counts for half
+    clock.now = 210.0
+    assert backend.count("fail:a", 60) == pytest.approx(1.5)
+    backend.add("fail:a", 60)
+    assert backend.count("fail:a", 60) == pytest.approx(2.5)
+
+    # Two windows later nothing is left
+    clock.now = 330.0
+    assert backend.count("fail:a", 60) == 0
+
+
+def test_window_helpers_skip_stale_state():
+    assert _advance_window(None, 60, 130.0) == (120.0, 1, 0)
+    assert _advance_window((120.0, 4, 2), 60, 130.0) == (120.0, 5, 2)
+    assert _advance_window((120.0, 4, 2), 60, 190.0) == (180.0, 1, 4)
+    assert _advance_window((120.0, 4, 2), 60, 250.0) == (240.0, 1, 0)
+    assert _weighted_count((120.0, 4, 2), 60, 300.0) == 0
+
+
+def test_repeated_failures_lock_out_the_email(monkeypatch, clock):
+    monkeypatch.setattr(rate_limit, "backend", MemoryBackend(max_keys=100))
+    login = SimpleNamespace(client=SimpleNamespace(host="10.0.0.1"))
+
+    for _ in range(rate_limit.LOGIN_MAX_FAILURES):
+        rate_limit.record_login_failure("Student@Example.com")
+
+    with pytest.raises(HTTPException) as excinfo:
+        rate_limit.check_login_attempt(login, "student@example.com")
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers["Retry-After"] == str(rate_limit.LOGIN_FAILURE_WINDOW_SECONDS)
+
+    rate_limit.record_login_success("student@example.com")
+    rate_limit.check_login_attempt(login, "student@example.com")